@@ -5,186 +5,266 @@ Analyzes user responses to identify patterns and overlaps between skills and pas
 """
 
 import re
-from collections import defaultdict, Counter
-from typing import Dict, List, Tuple, Set
+import copy
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple, Set
+
+from keyword_automaton import KeywordAutomaton
+
+# Number of distinct response sets whose analysis is kept for reuse
+ANALYSIS_CACHE_SIZE = 32
+
+# Position of each analysis prefix in the (skill_themes, passion_themes) buckets
+_BUCKET_INDEX = {'skill': 0, 'passion': 1}
+
+
+def _popcount(mask: int) -> int:
+    """Number of set bits in a mask"""
+    return bin(mask).count('1')
+
 
 class SkillsPassionsAnalyzer:
     """Analyzes user responses to find patterns between skills and passions"""
 
-    def __init__(self):
-        # Keyword mappings for different categories
-        self.skill_keywords = {
-            'teaching': ['teach', 'mentor', 'guide', 'explain', 'instruct', 'train', 'educate', 'coach'],
-            'leadership': ['lead', 'manage', 'organize', 'coordinate', 'direct', 'supervise', 'delegate'],
-            'communication': ['speak', 'write', 'present', 'communicate', 'express', 'articulate', 'convey'],
-            'helping': ['help', 'assist', 'support', 'serve', 'care', 'counsel', 'encourage', 'comfort'],
-            'creative': ['create', 'design', 'artistic', 'creative', 'imagine', 'innovate', 'craft', 'build'],
-            'analytical': ['analyze', 'research', 'investigate', 'study', 'examine', 'solve', 'logical'],
-            'administrative': ['organize', 'plan', 'schedule', 'coordinate', 'detail', 'systematic'],
-            'technical': ['technical', 'technology', 'programming', 'engineering', 'computing', 'digital']
-        }
+    # Keyword mappings for different categories (shared reference data)
+    skill_keywords = {
+        'teaching': ['teach', 'mentor', 'guide', 'explain', 'instruct', 'train', 'educate', 'coach'],
+        'leadership': ['lead', 'manage', 'organize', 'coordinate', 'direct', 'supervise', 'delegate'],
+        'communication': ['speak', 'write', 'present', 'communicate', 'express', 'articulate', 'convey'],
+        'helping': ['help', 'assist', 'support', 'serve', 'care', 'counsel', 'encourage', 'comfort'],
+        'creative': ['create', 'design', 'artistic', 'creative', 'imagine', 'innovate', 'craft', 'build'],
+        'analytical': ['analyze', 'research', 'investigate', 'study', 'examine', 'solve', 'logical'],
+        'administrative': ['organize', 'plan', 'schedule', 'coordinate', 'detail', 'systematic'],
+        'technical': ['technical', 'technology', 'programming', 'engineering', 'computing', 'digital']
+    }
 
-        self.passion_keywords = {
-            'people': ['people', 'relationships', 'community', 'social', 'family', 'friends', 'connection'],
-            'justice': ['justice', 'fair', 'equality', 'rights', 'advocacy', 'change', 'reform'],
-            'nature': ['nature', 'environment', 'outdoors', 'animals', 'earth', 'conservation'],
-            'creativity': ['art', 'music', 'creative', 'beauty', 'expression', 'imagination', 'design'],
-            'learning': ['learn', 'knowledge', 'education', 'study', 'growth', 'discovery', 'wisdom'],
-            'service': ['serve', 'volunteer', 'giving', 'ministry', 'mission', 'charity', 'helping'],
-            'innovation': ['innovation', 'technology', 'progress', 'future', 'advancement', 'improvement'],
-            'healing': ['health', 'healing', 'wellness', 'medical', 'therapy', 'recovery', 'wholeness']
-        }
+    passion_keywords = {
+        'people': ['people', 'relationships', 'community', 'social', 'family', 'friends', 'connection'],
+        'justice': ['justice', 'fair', 'equality', 'rights', 'advocacy', 'change', 'reform'],
+        'nature': ['nature', 'environment', 'outdoors', 'animals', 'earth', 'conservation'],
+        'creativity': ['art', 'music', 'creative', 'beauty', 'expression', 'imagination', 'design'],
+        'learning': ['learn', 'knowledge', 'education', 'study', 'growth', 'discovery', 'wisdom'],
+        'service': ['serve', 'volunteer', 'giving', 'ministry', 'mission', 'charity', 'helping'],
+        'innovation': ['innovation', 'technology', 'progress', 'future', 'advancement', 'improvement'],
+        'healing': ['health', 'healing', 'wellness', 'medical', 'therapy', 'recovery', 'wholeness']
+    }
 
-        self.spiritual_gift_indicators = {
-            'teaching': {
-                'skills': ['teaching', 'communication', 'analytical'],
-                'passions': ['learning', 'people'],
-                'description': 'The ability to understand and communicate truth in ways that help others learn and grow'
-            },
-            'leadership': {
-                'skills': ['leadership', 'communication', 'administrative'],
-                'passions': ['people', 'service', 'justice'],
-                'description': 'The ability to inspire and guide others toward common goals and positive change'
-            },
-            'helping': {
-                'skills': ['helping', 'communication'],
-                'passions': ['people', 'service', 'healing'],
-                'description': 'The gift of coming alongside others to provide practical assistance and emotional support'
-            },
-            'mercy': {
-                'skills': ['helping', 'communication'],
-                'passions': ['people', 'healing', 'justice'],
-                'description': 'Deep compassion that moves you to action when you see others suffering'
-            },
-            'administration': {
-                'skills': ['administrative', 'leadership', 'analytical'],
-                'passions': ['service', 'people'],
-                'description': 'The ability to organize resources and coordinate efforts to accomplish important goals'
-            },
-            'creativity': {
-                'skills': ['creative', 'communication'],
-                'passions': ['creativity', 'people', 'service'],
-                'description': 'Using artistic expression to inspire, heal, and bring beauty into the world'
-            },
-            'prophecy': {
-                'skills': ['communication', 'analytical'],
-                'passions': ['justice', 'people'],
-                'description': 'The ability to see truth clearly and speak it boldly for positive change'
-            },
-            'evangelism': {
-                'skills': ['communication', 'helping'],
-                'passions': ['people', 'service'],
-                'description': 'Natural ability to share good news and connect people with hope and purpose'
-            }
+    spiritual_gift_indicators = {
+        'teaching': {
+            'skills': ['teaching', 'communication', 'analytical'],
+            'passions': ['learning', 'people'],
+            'description': 'The ability to understand and communicate truth in ways that help others learn and grow'
+        },
+        'leadership': {
+            'skills': ['leadership', 'communication', 'administrative'],
+            'passions': ['people', 'service', 'justice'],
+            'description': 'The ability to inspire and guide others toward common goals and positive change'
+        },
+        'helping': {
+            'skills': ['helping', 'communication'],
+            'passions': ['people', 'service', 'healing'],
+            'description': 'The gift of coming alongside others to provide practical assistance and emotional support'
+        },
+        'mercy': {
+            'skills': ['helping', 'communication'],
+            'passions': ['people', 'healing', 'justice'],
+            'description': 'Deep compassion that moves you to action when you see others suffering'
+        },
+        'administration': {
+            'skills': ['administrative', 'leadership', 'analytical'],
+            'passions': ['service', 'people'],
+            'description': 'The ability to organize resources and coordinate efforts to accomplish important goals'
+        },
+        'creativity': {
+            'skills': ['creative', 'communication'],
+            'passions': ['creativity', 'people', 'service'],
+            'description': 'Using artistic expression to inspire, heal, and bring beauty into the world'
+        },
+        'prophecy': {
+            'skills': ['communication', 'analytical'],
+            'passions': ['justice', 'people'],
+            'description': 'The ability to see truth clearly and speak it boldly for positive change'
+        },
+        'evangelism': {
+            'skills': ['communication', 'helping'],
+            'passions': ['people', 'service'],
+            'description': 'Natural ability to share good news and connect people with hope and purpose'
         }
+    }
 
-    def extract_themes(self, responses: List[str]) -> Dict[str, int]:
-        """Extract themes from a list of response strings"""
-        themes = defaultdict(int)
-
-        for response in responses:
-            response_lower = response.lower()
-
-            # Check skill keywords
-            for skill_category, keywords in self.skill_keywords.items():
-                for keyword in keywords:
-                    if keyword in response_lower:
-                        themes[f"skill_{skill_category}"] += 1
+    @classmethod
+    def _build_tables(cls):
+        """
+        Build the lookup tables derived from the keyword data
+
+        Architecture Concept: The keyword data never changes, so everything compiled
+        from it is built once per process and shared by every analyzer instance
+        """
+        # Precompute indicator sets once so per-call matching is a plain set intersection
+        cls._gift_skill_sets = {gift: frozenset(indicators['skills'])
+                                for gift, indicators in cls.spiritual_gift_indicators.items()}
+        cls._gift_passion_sets = {gift: frozenset(indicators['passions'])
+                                  for gift, indicators in cls.spiritual_gift_indicators.items()}
+        cls._gift_skill_len = {gift: len(skill_set) for gift, skill_set in cls._gift_skill_sets.items()}
+        cls._gift_passion_len = {gift: len(passion_set) for gift, passion_set in cls._gift_passion_sets.items()}
+
+        # Give every category name a bit so alignment scoring is integer
+        # AND/popcount work instead of building sets on each call
+        category_bits = {}
+        for name in list(cls.skill_keywords) + list(cls.passion_keywords):
+            category_bits.setdefault(name, 1 << len(category_bits))
+        for indicators in cls.spiritual_gift_indicators.values():
+            for name in indicators['skills'] + indicators['passions']:
+                category_bits.setdefault(name, 1 << len(category_bits))
+        cls._category_bits = category_bits
+        cls._gift_masks = [
+            (sum(category_bits[name] for name in set(indicators['skills'])),
+             sum(category_bits[name] for name in set(indicators['passions'])))
+            for indicators in cls.spiritual_gift_indicators.values()
+        ]
 
-            # Check passion keywords
-            for passion_category, keywords in self.passion_keywords.items():
+        # Compile every skill and passion keyword into one automaton so each
+        # response is scanned once instead of once per keyword. Payloads carry
+        # (order, bucket, category) so hits land straight in the right counter.
+        automaton = KeywordAutomaton()
+        order = 0
+        for bucket, keyword_map in enumerate((cls.skill_keywords, cls.passion_keywords)):
+            for category, keywords in keyword_map.items():
                 for keyword in keywords:
-                    if keyword in response_lower:
-                        themes[f"passion_{passion_category}"] += 1
+                    automaton.add_keyword(keyword, (order, bucket, category))
+                order += 1
+        automaton.build()
+        cls._keyword_automaton = automaton
 
-        return dict(themes)
+    def __init__(self):
+        # Recent analyses keyed by the response texts they were built from (LRU order)
+        self._analysis_cache: OrderedDict = OrderedDict()
 
-    def analyze_skills(self, skills_responses: List[Dict]) -> Dict:
-        """Analyze skills assessment responses"""
-        if not skills_responses:
-            return {}
+    def extract_themes(self, responses: List[str],
+                       prefix: Optional[str] = None) -> Tuple[Counter, Counter]:
+        """
+        Extract (skill_themes, passion_themes) counters from a list of response strings
 
-        response_texts = [r.get('response', '') for r in skills_responses]
-        themes = self.extract_themes(response_texts)
+        Args:
+            prefix: 'skill' or 'passion' to count only that bucket; the other stays empty
+        """
+        buckets = (Counter(), Counter())
+        wanted = _BUCKET_INDEX.get(prefix)
 
-        # Filter to skill themes only
-        skill_themes = {k.replace('skill_', ''): v for k, v in themes.items() if k.startswith('skill_')}
+        for response in responses:
+            # Each keyword counts at most once per response
+            hits = self._keyword_automaton.distinct_matches(response.lower())
+            if wanted is not None:
+                hits = [hit for hit in hits if hit[1][1] == wanted]
 
-        # Find top skills
-        top_skills = sorted(skill_themes.items(), key=lambda x: x[1], reverse=True)[:3]
+            for _, (_, bucket, category) in sorted(hits, key=lambda hit: hit[1][0]):
+                buckets[bucket][category] += 1
 
-        return {
-            'raw_responses': response_texts,
-            'themes': skill_themes,
-            'top_skills': [skill for skill, _ in top_skills],
-            'skill_scores': dict(top_skills)
-        }
+        return buckets
 
-    def analyze_passions(self, passion_responses: List[Dict]) -> Dict:
-        """Analyze passion exploration responses"""
-        if not passion_responses:
+    def _analyze(self, response_texts: Sequence[str], prefix: str) -> Dict:
+        """Shared skills/passions analysis over one bucket of extracted themes"""
+        if not response_texts:
             return {}
 
-        response_texts = [r.get('response', '') for r in passion_responses]
-        themes = self.extract_themes(response_texts)
-
-        # Filter to passion themes only
-        passion_themes = {k.replace('passion_', ''): v for k, v in themes.items() if k.startswith('passion_')}
+        # Only this prefix's hits are routed, so the other bucket is never built
+        bucket_themes = self.extract_themes(response_texts, prefix)[_BUCKET_INDEX[prefix]]
+        category_themes = dict(bucket_themes)
 
-        # Find top passions
-        top_passions = sorted(passion_themes.items(), key=lambda x: x[1], reverse=True)[:3]
+        # Find top entries (ties keep first-seen order, like a stable sort)
+        top_entries = bucket_themes.most_common(3)
 
         return {
-            'raw_responses': response_texts,
-            'themes': passion_themes,
-            'top_passions': [passion for passion, _ in top_passions],
-            'passion_scores': dict(top_passions)
+            'raw_responses': list(response_texts),
+            'themes': category_themes,
+            f'top_{prefix}s': [name for name, _ in top_entries],
+            f'{prefix}_scores': dict(top_entries)
         }
 
-    def find_skill_passion_overlaps(self, skills_analysis: Dict, passions_analysis: Dict) -> List[Tuple[str, str, str]]:
-        """Find areas where skills and passions align"""
+    def analyze_skills(self, skills_responses: List[Dict]) -> Dict:
+        """Analyze skills assessment responses"""
+        return self._analyze([r.get('response', '') for r in skills_responses], 'skill')
+
+    def analyze_passions(self, passion_responses: List[Dict]) -> Dict:
+        """Analyze passion exploration responses"""
+        return self._analyze([r.get('response', '') for r in passion_responses], 'passion')
+
+    def find_skill_passion_overlaps(self, skills_analysis: Dict,
+                                    passions_analysis: Dict) -> List[Tuple[Tuple[str, ...], Tuple[str, ...], str]]:
+        """
+        Find areas where skills and passions align
+
+        Returns one (matching_skills, matching_passions, label) record per aligned
+        gift, plus a "direct_match" record for names that are both a skill and a passion.
+        """
         overlaps = []
 
         if not skills_analysis or not passions_analysis:
             return overlaps
 
-        skills = skills_analysis.get('top_skills', [])
-        passions = passions_analysis.get('top_passions', [])
+        skills_set = set(skills_analysis.get('top_skills', []))
+        passions_set = set(passions_analysis.get('top_passions', []))
 
         # Direct matches (same word/concept)
-        direct_matches = set(skills) & set(passions)
-        for match in direct_matches:
-            overlaps.append((match, match, "direct_match"))
+        direct_matches = tuple(sorted(skills_set & passions_set))
+        if direct_matches:
+            overlaps.append((direct_matches, direct_matches, "direct_match"))
 
         # Conceptual overlaps based on spiritual gift patterns
-        for gift, indicators in self.spiritual_gift_indicators.items():
-            skill_matches = len(set(skills) & set(indicators['skills']))
-            passion_matches = len(set(passions) & set(indicators['passions']))
+        for gift in self.spiritual_gift_indicators:
+            matching_skills = skills_set & self._gift_skill_sets[gift]
+            matching_passions = passions_set & self._gift_passion_sets[gift]
 
             # If we have matches in both skills and passions for this gift
-            if skill_matches > 0 and passion_matches > 0:
-                matching_skills = list(set(skills) & set(indicators['skills']))
-                matching_passions = list(set(passions) & set(indicators['passions']))
-
-                for skill in matching_skills:
-                    for passion in matching_passions:
-                        overlaps.append((skill, passion, gift))
+            if matching_skills and matching_passions:
+                overlaps.append((tuple(sorted(matching_skills)), tuple(sorted(matching_passions)), gift))
 
         return overlaps
 
+    def _to_mask(self, names: List[str]) -> Tuple[int, Set[str]]:
+        """Convert category names to a bitmask, returning any unknown names separately"""
+        mask = 0
+        unknown = set()
+        for name in names:
+            bit = self._category_bits.get(name)
+            if bit is None:
+                unknown.add(name)
+            else:
+                mask |= bit
+        return mask, unknown
+
     def calculate_alignment_score(self, skills_analysis: Dict, passions_analysis: Dict) -> float:
-        """Calculate a numerical score for skills-passions alignment"""
+        """
+        Calculate a numerical score for skills-passions alignment
+
+        Architecture Concept: Skills, passions and gift indicators are bitmasks, so
+        each gift check is two ANDs. Every matching skill/passion pair counts as
+        one overlap, so an aligned gift weighs |skills| * |passions|.
+        """
         if not skills_analysis or not passions_analysis:
             return 0.0
 
-        overlaps = self.find_skill_passion_overlaps(skills_analysis, passions_analysis)
+        skill_mask, skill_unknown = self._to_mask(skills_analysis.get('top_skills', []))
+        passion_mask, passion_unknown = self._to_mask(passions_analysis.get('top_passions', []))
+
+        # Direct matches (same word/concept)
+        overlap_count = _popcount(skill_mask & passion_mask) + len(skill_unknown & passion_unknown)
+
+        # Each aligned gift contributes one overlap per matching skill/passion pair
+        aligned_gifts = 0
+        for gift_skill_mask, gift_passion_mask in self._gift_masks:
+            skill_hits = skill_mask & gift_skill_mask
+            passion_hits = passion_mask & gift_passion_mask
+            if skill_hits and passion_hits:
+                overlap_count += _popcount(skill_hits) * _popcount(passion_hits)
+                aligned_gifts += 1
 
         # Base score from number of overlaps
-        overlap_score = min(len(overlaps) * 20, 60)  # Max 60 points from overlaps
+        overlap_score = min(overlap_count * 20, 60)  # Max 60 points from overlaps
 
         # Bonus for spiritual gift alignment
-        gift_alignments = [overlap for overlap in overlaps if overlap[2] in self.spiritual_gift_indicators]
-        gift_score = min(len(set(overlap[2] for overlap in gift_alignments)) * 10, 40)  # Max 40 points
+        gift_score = min(aligned_gifts * 10, 40)  # Max 40 points
 
         return min(overlap_score + gift_score, 100)
 
@@ -195,16 +275,16 @@ class SkillsPassionsAnalyzer:
         if not skills_analysis or not passions_analysis:
             return potential_gifts
 
-        skills = skills_analysis.get('top_skills', [])
-        passions = passions_analysis.get('top_passions', [])
+        skills_set = set(skills_analysis.get('top_skills', []))
+        passions_set = set(passions_analysis.get('top_passions', []))
 
         for gift_name, indicators in self.spiritual_gift_indicators.items():
-            skill_matches = set(skills) & set(indicators['skills'])
-            passion_matches = set(passions) & set(indicators['passions'])
+            skill_matches = skills_set & self._gift_skill_sets[gift_name]
+            passion_matches = passions_set & self._gift_passion_sets[gift_name]
 
             # Calculate strength score
-            skill_score = len(skill_matches) / len(indicators['skills'])
-            passion_score = len(passion_matches) / len(indicators['passions'])
+            skill_score = len(skill_matches) / self._gift_skill_len[gift_name]
+            passion_score = len(passion_matches) / self._gift_passion_len[gift_name]
             total_score = (skill_score + passion_score) / 2
 
             if total_score > 0:  # Any alignment
@@ -233,29 +313,59 @@ class SkillsPassionsAnalyzer:
             return "Potential"
 
     def generate_analysis_summary(self, user_responses: Dict) -> Dict:
-        """Generate comprehensive analysis of user's discovery session"""
+        """
+        Generate comprehensive analysis of user's discovery session
+
+        Architecture Concept: The analysis only depends on the response texts, so
+        repeat calls with the same answers (e.g. scoring then reporting) reuse it.
+        Each caller gets its own copy, so changing a result never alters later hits.
+        """
+        key = tuple(
+            tuple(r.get('response', '') for r in user_responses.get(stage, []))
+            for stage in ('skills_assessment', 'passion_exploration', 'values_clarification')
+        )
+
+        analysis = self._analysis_cache.get(key)
+        if analysis is None:
+            analysis = self._analyze_responses(*key)
+            self._analysis_cache[key] = analysis
+            if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        else:
+            self._analysis_cache.move_to_end(key)
+
+        analysis = copy.deepcopy(analysis)
+        return {
+            'skills_analysis': analysis['skills_analysis'],
+            'passions_analysis': analysis['passions_analysis'],
+            'skill_passion_overlaps': analysis['skill_passion_overlaps'],
+            'alignment_score': analysis['alignment_score'],
+            'potential_spiritual_gifts': analysis['potential_spiritual_gifts'],
+            'values_insights': analysis['values_insights'],
+            'analysis_timestamp': datetime.now().isoformat(),
+            'summary': analysis['summary']
+        }
+
+    def _analyze_responses(self, skill_texts: Tuple[str, ...], passion_texts: Tuple[str, ...],
+                           values_texts: Tuple[str, ...]) -> Dict:
+        """Run the full analysis pipeline over the response texts of each stage"""
 
         # Analyze skills and passions
-        skills_analysis = self.analyze_skills(user_responses.get('skills_assessment', []))
-        passions_analysis = self.analyze_passions(user_responses.get('passion_exploration', []))
+        skills_analysis = self._analyze(skill_texts, 'skill')
+        passions_analysis = self._analyze(passion_texts, 'passion')
 
         # Find overlaps and alignment
         overlaps = self.find_skill_passion_overlaps(skills_analysis, passions_analysis)
         alignment_score = self.calculate_alignment_score(skills_analysis, passions_analysis)
         potential_gifts = self.identify_potential_spiritual_gifts(skills_analysis, passions_analysis)
 
-        # Extract values insights
-        values_responses = user_responses.get('values_clarification', [])
-        values_text = ' '.join([r.get('response', '') for r in values_responses])
-
         return {
             'skills_analysis': skills_analysis,
             'passions_analysis': passions_analysis,
             'skill_passion_overlaps': overlaps,
             'alignment_score': alignment_score,
             'potential_spiritual_gifts': potential_gifts[:5],  # Top 5
-            'values_insights': values_text,
-            'analysis_timestamp': __import__('datetime').datetime.now().isoformat(),
+            'values_insights': ' '.join(values_texts),
             'summary': self._generate_text_summary(skills_analysis, passions_analysis, overlaps, potential_gifts)
         }
 
@@ -288,6 +398,9 @@ class SkillsPassionsAnalyzer:
         return '. '.join(summary_parts) + '.'
 
 
+SkillsPassionsAnalyzer._build_tables()
+
+
 if __name__ == "__main__":
     # Test the analyzer with sample data
     analyzer = SkillsPassionsAnalyzer()
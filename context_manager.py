@@ -5,13 +5,50 @@ Manages conversation context and provides intelligent context injection for LLM
 """
 
 import json
-from typing import Dict, List, Optional, Any
+import re
+from collections import deque
+from functools import lru_cache
+from heapq import nlargest
+from itertools import islice
+from operator import attrgetter
+from typing import Deque, Dict, List, Optional, Set, Any
 from datetime import datetime
 from dataclasses import dataclass
 
+from json_storage import save_json
+
+# Recent quotes kept per theme - bounds memory and save cost in long sessions
+MAX_THEME_EVIDENCE = 8
+
+# Base guidance for each stage
+_STAGE_GUIDANCE: Dict[str, str] = {
+    "introduction": "Build rapport and understand their motivation for discovery",
+    "skills_assessment": "Help identify natural talents and developed abilities",
+    "passion_exploration": "Uncover what truly energizes and motivates them",
+    "values_clarification": "Explore core beliefs and decision-making drivers",
+    "synthesis": "Help connect patterns between skills, passions, and values",
+    "recommendations": "Provide insights about spiritual gifts based on all information"
+}
+
+
+@lru_cache(maxsize=128)
+def _contextual_guidance(stage: str, strong_theme: Optional[str], has_recent_insights: bool) -> str:
+    """Assemble the guidance text - it depends on nothing else, so each combination is built once"""
+    guidance_parts = [f"STAGE GUIDANCE: {_STAGE_GUIDANCE.get(stage, 'Provide thoughtful guidance')}"]
+
+    if strong_theme is not None:
+        guidance_parts.append(f"CONTEXT: User shows strong {strong_theme} theme - explore this further")
+
+    if has_recent_insights:
+        guidance_parts.append("RECENT INSIGHTS: Build on what they've shared about their strengths")
+
+    return " | ".join(guidance_parts)
+
 @dataclass
 class ContextInsight:
     """Represents a key insight discovered during conversation"""
+    __slots__ = ('content', 'stage', 'confidence', 'timestamp', 'insight_type')
+
     content: str
     stage: str
     confidence: float  # 0.0 to 1.0
@@ -21,8 +58,11 @@ class ContextInsight:
 @dataclass
 class ConversationTheme:
     """Tracks emerging themes across the conversation"""
+    __slots__ = ('theme_name', 'evidence', 'mention_count', 'strength', 'first_mentioned')
+
     theme_name: str
-    evidence: List[str]  # Quotes/responses that support this theme
+    evidence: Deque[str]  # Most recent quotes/responses that support this theme
+    mention_count: int  # Every mention, including those no longer kept as evidence
     strength: float  # How strongly this theme appears
     first_mentioned: str  # Stage where it first appeared
 
@@ -37,16 +77,93 @@ class EnhancedContextManager:
     4. Intelligent Context Injection: Provide relevant context without overwhelming the LLM
     """
 
+    # Insight patterns - in real implementation, this would use LLM analysis
+    INSIGHT_PATTERNS = {
+        'strong_skill_indicator': [
+            ('people often come to me', 0.8),
+            ('i excel at', 0.8),
+            ('i\'m naturally good at', 0.9),
+            ('others seek me out', 0.8),
+            ('i find it easy to', 0.7)
+        ],
+        'passion_indicator': [
+            ('i love', 0.8),
+            ('makes me feel alive', 0.9),
+            ('lose track of time', 0.9),
+            ('deeply passionate about', 0.9),
+            ('stirs my heart', 0.8)
+        ],
+        'value_indicator': [
+            ('important to me', 0.7),
+            ('i believe in', 0.7),
+            ('guides my decisions', 0.8),
+            ('core value', 0.9)
+        ],
+        'gift_indicator': [
+            ('calling', 0.8),
+            ('ministry', 0.8),
+            ('gifted in', 0.9),
+            ('spiritual gift', 0.9)
+        ]
+    }
+
+    # Theme keywords (simplified - would use semantic analysis in production)
+    THEME_KEYWORDS = {
+        'teaching': ['teach', 'explain', 'mentor', 'guide', 'instruct', 'help others learn'],
+        'leadership': ['lead', 'direct', 'manage', 'organize', 'vision', 'inspire others'],
+        'helping': ['help', 'serve', 'support', 'assist', 'care for', 'come alongside'],
+        'creativity': ['create', 'design', 'artistic', 'express', 'beauty', 'innovation'],
+        'justice': ['justice', 'fairness', 'equality', 'advocate', 'stand up for', 'rights'],
+        'people_focus': ['people', 'relationships', 'community', 'connection', 'social']
+    }
+
     def __init__(self):
         self.insights: List[ContextInsight] = []
         self.themes: Dict[str, ConversationTheme] = {}
-        self.conversation_timeline: List[Dict] = []
         self.current_stage = "introduction"
 
         # Context management settings
         self.max_context_window = 8  # Keep last 8 exchanges in full detail
+
+        # Architecture Concept: A bounded deque is the context window - older exchanges
+        # fall off in O(1) as new ones arrive, with no list copy per exchange
+        self.conversation_timeline: Deque[Dict] = deque(maxlen=self.max_context_window)
         self.insight_threshold = 0.6  # Minimum confidence to store as insight
 
+        # Theme strengths only ever grow, so the strongest one can be tracked as they change.
+        # Ties go to the theme mentioned first, matching a max() over self.themes.
+        self._strongest_theme: Optional[ConversationTheme] = None
+        self._theme_rank: Dict[str, int] = {}
+
+        # Stages with at least one insight of confidence >= 0.7, kept as insights are added
+        self._confident_insight_stages: Set[str] = set()
+
+        # Insights of confidence >= 0.8 are counted, and the latest few kept, as they are
+        # added - summaries and prompts never rescan the whole insight list
+        self._high_confidence_count = 0
+        self._recent_key_insights: Deque[ContextInsight] = deque(maxlen=3)
+
+        # Precompile one alternation per insight type so each is a single regex pass.
+        # Insight phrases must match whole words.
+        self._insight_res = {
+            insight_type: re.compile(r'\b(' + '|'.join(re.escape(pattern) for pattern, _ in patterns) + r')\b')
+            for insight_type, patterns in self.INSIGHT_PATTERNS.items()
+        }
+
+        # All theme keywords share one regex scanned with a single finditer. Keywords are
+        # stems ('teach', 'mentor') so they only need to start on a word boundary. The
+        # lookahead keeps matches zero-width so one keyword never hides another, and trying
+        # the longest keyword first means every other keyword matching at that position is
+        # a prefix of it - the inverted index maps each keyword to the themes of all its prefixes.
+        theme_keywords = sorted({keyword for keywords in self.THEME_KEYWORDS.values() for keyword in keywords},
+                                key=len, reverse=True)
+        self._theme_re = re.compile(r'\b(?=(' + '|'.join(re.escape(keyword) for keyword in theme_keywords) + r'))')
+        self._kw_to_themes: Dict[str, List[str]] = {
+            keyword: [theme_name for theme_name, keywords in self.THEME_KEYWORDS.items()
+                      if any(keyword.startswith(prefix) for prefix in keywords)]
+            for keyword in theme_keywords
+        }
+
     def add_exchange(self, user_input: str, bot_response: str, stage: str):
         """
         Add a conversation exchange and extract insights
@@ -64,16 +181,16 @@ class EnhancedContextManager:
         self.conversation_timeline.append(exchange)
         self.current_stage = stage
 
+        # Lowercase once and share it between both extractors
+        user_lower = user_input.lower()
+
         # Extract insights from this exchange
-        self._extract_insights_from_exchange(user_input, stage)
+        self._extract_insights_from_exchange(user_input, user_lower, stage, exchange["timestamp"])
 
         # Update themes
-        self._update_themes(user_input, stage)
-
-        # Maintain context window size
-        self._manage_context_window()
+        self._update_themes(user_input, user_lower, stage)
 
-    def _extract_insights_from_exchange(self, user_input: str, stage: str):
+    def _extract_insights_from_exchange(self, user_input: str, user_lower: str, stage: str, timestamp: str):
         """
         Extract key insights from user input using pattern recognition
 
@@ -81,101 +198,66 @@ class EnhancedContextManager:
         In a more advanced system, we'd use the LLM itself to identify insights
         """
 
-        # Insight patterns - in real implementation, this would use LLM analysis
-        insight_patterns = {
-            'strong_skill_indicator': [
-                ('people often come to me', 0.8),
-                ('i excel at', 0.8),
-                ('i\'m naturally good at', 0.9),
-                ('others seek me out', 0.8),
-                ('i find it easy to', 0.7)
-            ],
-            'passion_indicator': [
-                ('i love', 0.8),
-                ('makes me feel alive', 0.9),
-                ('lose track of time', 0.9),
-                ('deeply passionate about', 0.9),
-                ('stirs my heart', 0.8)
-            ],
-            'value_indicator': [
-                ('important to me', 0.7),
-                ('i believe in', 0.7),
-                ('guides my decisions', 0.8),
-                ('core value', 0.9)
-            ],
-            'gift_indicator': [
-                ('calling', 0.8),
-                ('ministry', 0.8),
-                ('gifted in', 0.9),
-                ('spiritual gift', 0.9)
-            ]
-        }
-
-        user_lower = user_input.lower()
+        for insight_type, patterns in self.INSIGHT_PATTERNS.items():
+            matched = set(self._insight_res[insight_type].findall(user_lower))
+            if not matched:
+                continue
 
-        for insight_type, patterns in insight_patterns.items():
             for pattern, confidence in patterns:
-                if pattern in user_lower:
+                if pattern in matched:
                     insight = ContextInsight(
                         content=user_input,
                         stage=stage,
                         confidence=confidence,
-                        timestamp=datetime.now().isoformat(),
+                        timestamp=timestamp,
                         insight_type=insight_type
                     )
 
                     if confidence >= self.insight_threshold:
                         self.insights.append(insight)
+                        if confidence >= 0.7:
+                            self._confident_insight_stages.add(stage)
+                        if confidence >= 0.8:
+                            self._high_confidence_count += 1
+                            self._recent_key_insights.append(insight)
 
-    def _update_themes(self, user_input: str, stage: str):
+    def _update_themes(self, user_input: str, user_lower: str, stage: str):
         """
         Track recurring themes across the conversation
 
         Architecture Note: Theme tracking helps identify patterns that span multiple exchanges
         """
 
-        # Theme keywords (simplified - would use semantic analysis in production)
-        theme_keywords = {
-            'teaching': ['teach', 'explain', 'mentor', 'guide', 'instruct', 'help others learn'],
-            'leadership': ['lead', 'direct', 'manage', 'organize', 'vision', 'inspire others'],
-            'helping': ['help', 'serve', 'support', 'assist', 'care for', 'come alongside'],
-            'creativity': ['create', 'design', 'artistic', 'express', 'beauty', 'innovation'],
-            'justice': ['justice', 'fairness', 'equality', 'advocate', 'stand up for', 'rights'],
-            'people_focus': ['people', 'relationships', 'community', 'connection', 'social']
-        }
+        matched_themes = set()
+        for match in self._theme_re.finditer(user_lower):
+            matched_themes.update(self._kw_to_themes[match.group(1)])
 
-        user_lower = user_input.lower()
-
-        for theme_name, keywords in theme_keywords.items():
-            matches = [kw for kw in keywords if kw in user_lower]
-
-            if matches:
-                if theme_name not in self.themes:
-                    self.themes[theme_name] = ConversationTheme(
+        for theme_name in self.THEME_KEYWORDS:
+            if theme_name in matched_themes:
+                theme = self.themes.get(theme_name)
+                if theme is None:
+                    theme = self.themes[theme_name] = ConversationTheme(
                         theme_name=theme_name,
-                        evidence=[user_input],
+                        evidence=deque([user_input], maxlen=MAX_THEME_EVIDENCE),
+                        mention_count=1,
                         strength=1.0,
                         first_mentioned=stage
                     )
+                    self._theme_rank[theme_name] = len(self._theme_rank)
                 else:
-                    # Strengthen existing theme
-                    self.themes[theme_name].evidence.append(user_input)
-                    self.themes[theme_name].strength += 0.5
+                    # Strengthen existing theme, skipping a repeat of the last quote
+                    theme.mention_count += 1
+                    if not theme.evidence or theme.evidence[-1] != user_input:
+                        theme.evidence.append(user_input)
 
                     # Cap strength at reasonable level
-                    if self.themes[theme_name].strength > 5.0:
-                        self.themes[theme_name].strength = 5.0
+                    theme.strength = min(theme.strength + 0.5, 5.0)
 
-    def _manage_context_window(self):
-        """
-        Keep conversation timeline within manageable size
-
-        Architecture Concept: Context windowing prevents LLM prompts from becoming too long
-        """
-        if len(self.conversation_timeline) > self.max_context_window:
-            # Keep the most recent exchanges, summarize older ones
-            recent_exchanges = self.conversation_timeline[-self.max_context_window:]
-            self.conversation_timeline = recent_exchanges
+                strongest = self._strongest_theme
+                if (strongest is None or theme.strength > strongest.strength or
+                        (theme.strength == strongest.strength and
+                         self._theme_rank[theme_name] < self._theme_rank[strongest.theme_name])):
+                    self._strongest_theme = theme
 
     def build_context_for_llm(self, current_user_input: str = None) -> str:
         """
@@ -186,26 +268,22 @@ class EnhancedContextManager:
         context_parts = []
 
         # Add key insights summary
-        if self.insights:
-            high_confidence_insights = [i for i in self.insights if i.confidence >= 0.8]
-            if high_confidence_insights:
-                context_parts.append("KEY INSIGHTS DISCOVERED:")
-                for insight in high_confidence_insights[-3:]:  # Last 3 high-confidence insights
-                    context_parts.append(f"  • {insight.stage}: {insight.content[:100]}...")
+        if self._recent_key_insights:
+            context_parts.append("KEY INSIGHTS DISCOVERED:")
+            for insight in self._recent_key_insights:  # Last 3 high-confidence insights
+                context_parts.append(f"  • {insight.stage}: {insight.content[:100]}...")
 
         # Add strongest themes
-        if self.themes:
-            strong_themes = [(name, theme) for name, theme in self.themes.items() if theme.strength >= 2.0]
-            strong_themes.sort(key=lambda x: x[1].strength, reverse=True)
-
-            if strong_themes:
-                context_parts.append("\nEMERGING THEMES:")
-                for theme_name, theme in strong_themes[:3]:  # Top 3 themes
-                    context_parts.append(f"  • {theme_name.title()}: Mentioned {len(theme.evidence)} times (strength: {theme.strength:.1f})")
+        strong_themes = self.top_themes(3, min_strength=2.0)
+        if strong_themes:
+            context_parts.append("\nEMERGING THEMES:")
+            for theme in strong_themes:
+                context_parts.append(f"  • {theme.theme_name.title()}: Mentioned {theme.mention_count} times (strength: {theme.strength:.1f})")
 
         # Add recent conversation
         context_parts.append("\nRECENT CONVERSATION:")
-        for exchange in self.conversation_timeline[-3:]:  # Last 3 exchanges
+        recent_start = max(len(self.conversation_timeline) - 3, 0)
+        for exchange in islice(self.conversation_timeline, recent_start, None):  # Last 3 exchanges
             context_parts.append(f"  User: {exchange['user_input']}")
             context_parts.append(f"  Guide: {exchange['bot_response'][:150]}...")
 
@@ -221,33 +299,30 @@ class EnhancedContextManager:
 
         Architecture Concept: Adaptive guidance based on discovered patterns
         """
-        guidance_parts = []
-
-        # Base guidance for stage
-        stage_guidance = {
-            "introduction": "Build rapport and understand their motivation for discovery",
-            "skills_assessment": "Help identify natural talents and developed abilities",
-            "passion_exploration": "Uncover what truly energizes and motivates them",
-            "values_clarification": "Explore core beliefs and decision-making drivers",
-            "synthesis": "Help connect patterns between skills, passions, and values",
-            "recommendations": "Provide insights about spiritual gifts based on all information"
-        }
+        # Only a strong theme's name and whether this stage has confident insights
+        # vary between turns, so the text itself comes from a cache
+        strongest_theme = self._strongest_theme
+        strong_theme = None
+        if strongest_theme is not None and strongest_theme.strength >= 2.0:
+            strong_theme = strongest_theme.theme_name
 
-        base_guidance = stage_guidance.get(stage, "Provide thoughtful guidance")
-        guidance_parts.append(f"STAGE GUIDANCE: {base_guidance}")
+        return _contextual_guidance(stage, strong_theme, stage in self._confident_insight_stages)
 
-        # Add contextual guidance based on themes
-        if self.themes:
-            strongest_theme = max(self.themes.values(), key=lambda t: t.strength)
-            if strongest_theme.strength >= 2.0:
-                guidance_parts.append(f"CONTEXT: User shows strong {strongest_theme.theme_name} theme - explore this further")
+    def has_theme_with_strength(self, strength: float) -> bool:
+        """Whether any theme has reached the given strength - only the strongest needs checking"""
+        return self._strongest_theme is not None and self._strongest_theme.strength >= strength
 
-        # Add insight-based guidance
-        recent_insights = [i for i in self.insights if i.stage == stage and i.confidence >= 0.7]
-        if recent_insights:
-            guidance_parts.append("RECENT INSIGHTS: Build on what they've shared about their strengths")
+    def top_themes(self, count: int, min_strength: float = 0.0) -> List[ConversationTheme]:
+        """
+        The strongest themes with at least min_strength, strongest first
 
-        return " | ".join(guidance_parts)
+        Ties go to the theme mentioned first. Nothing is scanned when even the
+        tracked strongest theme falls short, and only the top `count` are ordered.
+        """
+        if not self.has_theme_with_strength(min_strength):
+            return []
+        return nlargest(count, (theme for theme in self.themes.values() if theme.strength >= min_strength),
+                        key=attrgetter('strength'))
 
     def should_suggest_deep_dive(self, theme: str) -> bool:
         """
@@ -258,46 +333,63 @@ class EnhancedContextManager:
         if theme in self.themes:
             theme_obj = self.themes[theme]
             # Suggest deep dive if theme is strong and appeared in multiple stages
-            return theme_obj.strength >= 2.5 and len(theme_obj.evidence) >= 3
+            return theme_obj.strength >= 2.5 and theme_obj.mention_count >= 3
         return False
 
+    def high_confidence_insight_count(self) -> int:
+        """Number of insights with confidence >= 0.8, counted as they are added"""
+        return self._high_confidence_count
+
     def get_conversation_summary(self) -> Dict[str, Any]:
         """Generate summary of conversation state for debugging/analysis"""
         return {
             "total_exchanges": len(self.conversation_timeline),
             "current_stage": self.current_stage,
             "insights_count": len(self.insights),
-            "themes": {name: {"strength": theme.strength, "evidence_count": len(theme.evidence)}
+            "themes": {name: {"strength": theme.strength, "evidence_count": theme.mention_count}
                       for name, theme in self.themes.items()},
-            "high_confidence_insights": len([i for i in self.insights if i.confidence >= 0.8])
+            "high_confidence_insights": self._high_confidence_count
         }
 
     def save_context(self, filename: str):
-        """Save context state for session persistence"""
+        """
+        Save context state for session persistence
+
+        Architecture Concept: Insights, themes and the timeline are handed to the
+        serializer as-is instead of being copied into a parallel dict tree first
+        """
         context_data = {
-            "insights": [
-                {
-                    "content": i.content,
-                    "stage": i.stage,
-                    "confidence": i.confidence,
-                    "timestamp": i.timestamp,
-                    "insight_type": i.insight_type
-                } for i in self.insights
-            ],
-            "themes": {
-                name: {
-                    "theme_name": theme.theme_name,
-                    "evidence": theme.evidence,
-                    "strength": theme.strength,
-                    "first_mentioned": theme.first_mentioned
-                } for name, theme in self.themes.items()
-            },
+            "insights": self.insights,
+            "themes": self.themes,
             "conversation_timeline": self.conversation_timeline,
             "current_stage": self.current_stage
         }
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(context_data, f, indent=2, ensure_ascii=False)
+        save_json(filename, context_data)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Build the saved form of the context, as save_context writes it
+
+        Architecture Concept: Everything that keeps changing is copied, so the snapshot
+        can be serialized on a background thread while the conversation carries on.
+        Insights and timeline entries are never modified once added, so they are shared.
+        """
+        return {
+            "insights": list(self.insights),
+            "themes": {
+                name: ConversationTheme(
+                    theme_name=theme.theme_name,
+                    evidence=list(theme.evidence),
+                    mention_count=theme.mention_count,
+                    strength=theme.strength,
+                    first_mentioned=theme.first_mentioned
+                )
+                for name, theme in self.themes.items()
+            },
+            "conversation_timeline": list(self.conversation_timeline),
+            "current_stage": self.current_stage
+        }
 
 
 if __name__ == "__main__":
@@ -4,8 +4,13 @@ Demo conversation script to test the bot without interactive input
 """
 
 from hello_bot import HelloBot
+import asyncio
 import time
 
+async def fetch_responses(bot, prompts):
+    """Send every demo prompt at once - they don't depend on each other"""
+    return await asyncio.gather(*(bot.acall_gemini(prompt) for prompt in prompts))
+
 def demo_conversation():
     """Simulate a conversation with the bot"""
     print("=== Demo Conversation with Spiritual Discovery Bot ===\n")
@@ -25,21 +30,21 @@ def demo_conversation():
     Respond warmly and ask thoughtful questions that help the person reflect on their strengths, interests, and what brings them joy.
     Keep responses concise but meaningful."""
     
+    # Build the full prompts and request all responses concurrently
+    prompts = [f"{system_prompt}\n\nUser: {user_message}\n\nBot:" for user_message in conversation]
+    responses = asyncio.run(fetch_responses(bot, prompts))
+    
     print("Bot: Hello! I'm your spiritual discovery guide.")
     print("Bot: I'm here to help you explore your gifts and passions.\n")
     
-    for i, user_message in enumerate(conversation, 1):
+    for user_message, response in zip(conversation, responses):
         print(f"User: {user_message}")
         
-        # Build the full prompt
-        full_prompt = f"{system_prompt}\n\nUser: {user_message}\n\nBot:"
-        
         print("Bot: ", end="", flush=True)
         
         # Add a small delay to simulate thinking
         time.sleep(1)
         
-        response = bot.call_gemini(full_prompt)
         print(response)
         print("-" * 50)
         
@@ -6,16 +6,146 @@ Implements structured question progression system for spiritual gifts discovery
 
 import os
 import json
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Union
 from dotenv import load_dotenv
 
+from json_storage import save_json, load_json, loads, dumps, ensure_directory, timestamp_to_iso, shared_writer
+from response_cache import ResponseCache
+
 # Load environment variables
 load_dotenv()
 
+
+@dataclass
+class Response:
+    """
+    One stored answer in a discovery session
+
+    Architecture Concept: A slotted record is a fraction of the size of a dict per answer.
+    It still supports r["response"] / r.get("response") so analysis code written
+    against plain response dicts keeps working unchanged.
+    """
+    __slots__ = ("response", "timestamp", "question_number")
+
+    response: str
+    timestamp: Union[int, str]  # epoch nanoseconds, or ISO text for loaded sessions
+    question_number: int
+
+    def __getitem__(self, key):
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def keys(self):
+        return self.__slots__
+
+
+# Question templates and prompt pieces are fixed reference data, built once at import
+_QUESTION_TEMPLATES = {
+    "introduction": (
+        "Hello! I'm excited to guide you on this journey of self-discovery. What's your name, and what drew you to explore your spiritual gifts and passions today?",
+        "Tell me a bit about yourself - what brings you joy in your daily life?",
+        "Have you ever taken any personality or spiritual gifts assessments before? What did you learn?"
+    ),
+
+    "skills_assessment": (
+        "Let's explore your natural talents. What activities do you find yourself excelling at with minimal effort?",
+        "Think about compliments you often receive from others. What strengths do people frequently notice in you?",
+        "What skills have you developed over the years that others come to you for help with?",
+        "In what areas do you feel confident teaching or mentoring others?"
+    ),
+
+    "passion_exploration": (
+        "What activities make you lose track of time because you're so engaged?",
+        "When you daydream about your ideal life, what are you doing?",
+        "What causes or issues in the world stir something deep within you?",
+        "Think of a time when you felt most alive and energized. What were you doing?"
+    ),
+
+    "values_clarification": (
+        "What principles or values guide your most important decisions?",
+        "What would you want to be remembered for at the end of your life?",
+        "What injustices or problems in the world motivate you to take action?",
+        "What does 'making a difference' mean to you personally?"
+    ),
+
+    "synthesis": (
+        "Looking at what we've discussed about your skills and passions, where do you see the strongest overlap?",
+        "What patterns do you notice emerging from our conversation?",
+        "If you could design a role that combines your best skills with your deepest passions, what would it look like?"
+    ),
+
+    "recommendations": (
+        "Based on our journey together, I'd like to offer some insights about your spiritual gifts. Are you ready to explore these discoveries?",
+        "What resonates most strongly with you from what we've uncovered?",
+        "How might you begin to explore or develop these gifts further?"
+    )
+}
+
+_STAGE_GUIDANCE = {
+    "introduction": "Focus on building rapport and understanding their motivation for spiritual discovery.",
+    "skills_assessment": "Help them identify natural talents and developed abilities.",
+    "passion_exploration": "Uncover what truly energizes and motivates them.",
+    "values_clarification": "Explore their core beliefs and what drives their decisions.",
+    "synthesis": "Help them see patterns and connections between skills, passions, and values.",
+    "recommendations": "Provide insights about potential spiritual gifts based on all gathered information."
+}
+
+# Stages whose responses feed the prompt context, with their labels
+_CONTEXT_LABELS = (
+    ("introduction", "User background"),
+    ("skills_assessment", "Identified skills"),
+    ("passion_exploration", "Core passions"),
+    ("values_clarification", "Key values")
+)
+
+_PROMPT_SKELETON = """You are a wise spiritual guide helping someone discover their gifts and calling.
+
+CURRENT STAGE: {stage_title}
+STAGE GUIDANCE: {guidance}
+
+CONVERSATION CONTEXT:
+{context}
+
+USER'S LATEST RESPONSE: {user_response}
+
+Respond with warmth and insight. {guidance} Ask thoughtful follow-up questions that help them go deeper. Keep your response concise but meaningful."""
+
+
+@lru_cache(maxsize=32)
+def _prompt_frame(stage):
+    """
+    Split the prompt skeleton for a stage into the static text around its per-turn fields
+
+    Only the context and the user's response change between turns, so everything
+    else is formatted once per stage and reused.
+    """
+    frame = _PROMPT_SKELETON.format_map({
+        "stage_title": stage.title(),
+        "guidance": _STAGE_GUIDANCE.get(stage, "Provide thoughtful, encouraging guidance."),
+        "context": "\x00",
+        "user_response": "\x00"
+    })
+    return tuple(frame.split("\x00"))
+
 class DiscoverySession:
     """Manages the structured self-discovery journey with progressive stages"""
 
+    # Fixed attribute set - no per-instance __dict__, cheaper attribute access
+    __slots__ = ("stages", "current_stage", "stage_progress", "user_responses",
+                 "session_id", "_context_cache")
+
     def __init__(self):
         self.stages = [
             "introduction",
@@ -31,6 +161,9 @@ class DiscoverySession:
         self.user_responses = {}  # Store responses by category
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+        # Joined context text per stage as (responses included, text) - extended as responses arrive
+        self._context_cache = {}
+
         # Initialize response storage
         for stage in self.stages:
             self.user_responses[stage] = []
@@ -42,50 +175,15 @@ class DiscoverySession:
             return self.stages[self.current_stage]
         return "completed"
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def stage_title(stage):
+        """Display name of a stage, e.g. 'skills_assessment' -> 'Skills Assessment' (computed once per stage)"""
+        return stage.replace('_', ' ').title()
+
     def get_stage_questions(self, stage):
         """Get question templates for each stage"""
-        question_templates = {
-            "introduction": [
-                "Hello! I'm excited to guide you on this journey of self-discovery. What's your name, and what drew you to explore your spiritual gifts and passions today?",
-                "Tell me a bit about yourself - what brings you joy in your daily life?",
-                "Have you ever taken any personality or spiritual gifts assessments before? What did you learn?"
-            ],
-
-            "skills_assessment": [
-                "Let's explore your natural talents. What activities do you find yourself excelling at with minimal effort?",
-                "Think about compliments you often receive from others. What strengths do people frequently notice in you?",
-                "What skills have you developed over the years that others come to you for help with?",
-                "In what areas do you feel confident teaching or mentoring others?"
-            ],
-
-            "passion_exploration": [
-                "What activities make you lose track of time because you're so engaged?",
-                "When you daydream about your ideal life, what are you doing?",
-                "What causes or issues in the world stir something deep within you?",
-                "Think of a time when you felt most alive and energized. What were you doing?"
-            ],
-
-            "values_clarification": [
-                "What principles or values guide your most important decisions?",
-                "What would you want to be remembered for at the end of your life?",
-                "What injustices or problems in the world motivate you to take action?",
-                "What does 'making a difference' mean to you personally?"
-            ],
-
-            "synthesis": [
-                "Looking at what we've discussed about your skills and passions, where do you see the strongest overlap?",
-                "What patterns do you notice emerging from our conversation?",
-                "If you could design a role that combines your best skills with your deepest passions, what would it look like?"
-            ],
-
-            "recommendations": [
-                "Based on our journey together, I'd like to offer some insights about your spiritual gifts. Are you ready to explore these discoveries?",
-                "What resonates most strongly with you from what we've uncovered?",
-                "How might you begin to explore or develop these gifts further?"
-            ]
-        }
-
-        return question_templates.get(stage, [])
+        return _QUESTION_TEMPLATES.get(stage, ())
 
     def get_next_question(self, previous_answers=None):
         """Get the next question based on current stage and progress"""
@@ -112,12 +210,12 @@ class DiscoverySession:
         if current_stage_name == "completed":
             return False
 
-        # Store the response
-        self.user_responses[current_stage_name].append({
-            "response": user_response,
-            "timestamp": datetime.now().isoformat(),
-            "question_number": self.stage_progress[current_stage_name]["question_count"]
-        })
+        # Store the response (timestamp in epoch nanoseconds - converted to ISO when saved)
+        self.user_responses[current_stage_name].append(Response(
+            response=user_response,
+            timestamp=time.time_ns(),
+            question_number=self.stage_progress[current_stage_name]["question_count"]
+        ))
 
         # Increment question count for this stage
         self.stage_progress[current_stage_name]["question_count"] += 1
@@ -133,56 +231,43 @@ class DiscoverySession:
 
     def build_contextual_prompt(self, stage, user_response=None):
         """Build context-aware prompt for the LLM"""
-        # Gather all previous responses for context
-        context_parts = []
-
-        # Add user information from introduction
-        if "introduction" in self.user_responses and self.user_responses["introduction"]:
-            intro_responses = [r["response"] for r in self.user_responses["introduction"]]
-            context_parts.append(f"User background: {' | '.join(intro_responses)}")
-
-        # Add skills from skills assessment
-        if "skills_assessment" in self.user_responses and self.user_responses["skills_assessment"]:
-            skills_responses = [r["response"] for r in self.user_responses["skills_assessment"]]
-            context_parts.append(f"Identified skills: {' | '.join(skills_responses)}")
-
-        # Add passions from exploration
-        if "passion_exploration" in self.user_responses and self.user_responses["passion_exploration"]:
-            passion_responses = [r["response"] for r in self.user_responses["passion_exploration"]]
-            context_parts.append(f"Core passions: {' | '.join(passion_responses)}")
-
-        # Add values
-        if "values_clarification" in self.user_responses and self.user_responses["values_clarification"]:
-            values_responses = [r["response"] for r in self.user_responses["values_clarification"]]
-            context_parts.append(f"Key values: {' | '.join(values_responses)}")
-
-        # Build the contextual prompt
-        context = "\n".join(context_parts) if context_parts else "Beginning of conversation"
-
-        stage_guidance = {
-            "introduction": "Focus on building rapport and understanding their motivation for spiritual discovery.",
-            "skills_assessment": "Help them identify natural talents and developed abilities.",
-            "passion_exploration": "Uncover what truly energizes and motivates them.",
-            "values_clarification": "Explore their core beliefs and what drives their decisions.",
-            "synthesis": "Help them see patterns and connections between skills, passions, and values.",
-            "recommendations": "Provide insights about potential spiritual gifts based on all gathered information."
-        }
-
-        guidance = stage_guidance.get(stage, "Provide thoughtful, encouraging guidance.")
-
-        prompt = f"""You are a wise spiritual guide helping someone discover their gifts and calling.
-
-CURRENT STAGE: {stage.title()}
-STAGE GUIDANCE: {guidance}
-
-CONVERSATION CONTEXT:
-{context}
-
-USER'S LATEST RESPONSE: {user_response if user_response else "None yet"}
+        prefix, middle, suffix = _prompt_frame(stage)
+
+        # One pass over the stages feeds a single piece list that is joined once into
+        # the whole prompt - no per-line strings or separate context join
+        pieces = [prefix]
+        separator = ""
+        for stage_name, label in _CONTEXT_LABELS:
+            stage_context = self._get_stage_context(stage_name)
+            if stage_context is not None:
+                pieces += (separator, label, ": ", stage_context)
+                separator = "\n"
+        if not separator:
+            pieces.append("Beginning of conversation")
+
+        pieces += (middle, user_response if user_response else "None yet", suffix)
+        return "".join(pieces)
+
+    def _get_stage_context(self, stage):
+        """
+        Return the ' | '-joined responses for a stage, or None if it has none
+
+        Architecture Concept: Responses are only ever appended, so the cached text is
+        extended with the new ones instead of re-joining the whole stage every turn
+        """
+        responses = self.user_responses.get(stage)
+        if not responses:
+            return None
 
-Respond with warmth and insight. {guidance} Ask thoughtful follow-up questions that help them go deeper. Keep your response concise but meaningful."""
+        count, text = self._context_cache.get(stage, (0, None))
+        if count != len(responses):
+            if 0 < count < len(responses):
+                text = text + ' | ' + ' | '.join(r["response"] for r in responses[count:])
+            else:
+                text = ' | '.join(r["response"] for r in responses)
+            self._context_cache[stage] = (len(responses), text)
 
-        return prompt
+        return text
 
     def get_session_summary(self):
         """Generate a summary of the discovery session"""
@@ -196,60 +281,149 @@ Respond with warmth and insight. {guidance} Ask thoughtful follow-up questions t
 
         return summary
 
-    def save_session(self, filename=None):
-        """Save the discovery session to a JSON file"""
-        if not filename:
-            filename = f"discovery_sessions/discovery_{self.session_id}.json"
+    def session_filename(self):
+        """Default file a session is saved to"""
+        return f"discovery_sessions/discovery_{self.session_id}.json"
+
+    def snapshot(self):
+        """
+        Build the saved form of the session
 
-        os.makedirs("discovery_sessions", exist_ok=True)
+        Architecture Concept: Everything mutable is copied, so the snapshot can be
+        serialized on a background thread while the conversation carries on
+        """
+        stage_progress = {stage: dict(progress) for stage, progress in self.stage_progress.items()}
+        summary = self.get_session_summary()
+        summary["progress"] = stage_progress
 
-        session_data = {
+        return {
             "session_id": self.session_id,
             "created": datetime.now().isoformat(),
             "current_stage": self.current_stage,
-            "stage_progress": self.stage_progress,
-            "user_responses": self.user_responses,
-            "summary": self.get_session_summary()
+            "stage_progress": stage_progress,
+            "user_responses": {
+                stage: [dict(r, timestamp=timestamp_to_iso(r.get("timestamp"))) for r in responses]
+                for stage, responses in self.user_responses.items()
+            },
+            "summary": summary
         }
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
+    def save_session(self, filename=None):
+        """Save the discovery session to a JSON file"""
+        if not filename:
+            filename = self.session_filename()
+
+        ensure_directory(os.path.dirname(filename))
+        save_json(filename, self.snapshot())
 
         return filename
 
     def load_session(self, filename):
         """Load a previous discovery session"""
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
+            session_data = load_json(filename)
 
             self.session_id = session_data["session_id"]
             self.current_stage = session_data["current_stage"]
             self.stage_progress = session_data["stage_progress"]
-            self.user_responses = session_data["user_responses"]
+            self.user_responses = {
+                stage: [Response(**r) for r in responses]
+                for stage, responses in session_data["user_responses"].items()
+            }
+            self._context_cache = {}
 
             return True
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError) as e:
             print(f"Error loading session: {e}")
             return False
 
 
+_GEMINI_MODEL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest"
+_HEADERS = {"Content-Type": "application/json"}
+
+# Stands in for the prompt while the static request body is serialized; the control
+# characters keep it from ever matching text the body legitimately contains
+_PROMPT_SENTINEL = "\x00PROMPT\x00"
+
+# Seconds to wait for a connection to Gemini, then for each read of its response
+_REQUEST_TIMEOUT = (5, 30)
+
+
+def _new_http_session():
+    """A requests session for Gemini that retries transient failures with a short backoff"""
+    session = requests.Session()
+    session.headers.update(_HEADERS)
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=frozenset(["POST"]))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry))
+    return session
+
+
+@lru_cache(maxsize=None)
+def _gemini_urls(api_key):
+    """Build the generate and stream URLs for an API key once"""
+    return (
+        f"{_GEMINI_MODEL}:generateContent?key={api_key}",
+        f"{_GEMINI_MODEL}:streamGenerateContent?alt=sse&key={api_key}"
+    )
+
+
 class DiscoveryBot:
     """Enhanced bot with structured discovery journey"""
 
-    def __init__(self):
+    __slots__ = ("api_key", "api_url", "stream_url", "discovery_session",
+                 "response_cache", "_executor", "_session_writer", "session", "system_prompt",
+                 "_system_instruction", "_body_prefix", "_body_suffix", "_commands",
+                 "_max_command_length")
+
+    def __init__(self, cache_responses=False):
         self.api_key = os.getenv('GOOGLE_API_KEY')
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
 
-        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={self.api_key}"
+        self.api_url, self.stream_url = _gemini_urls(self.api_key)
         self.discovery_session = DiscoverySession()
 
+        # Replaying earlier responses for identical or reworded prompts is opt-in
+        self.response_cache = ResponseCache() if cache_responses else None
+
+        # The first streamed chunk and cache embeddings run here, off the input loop
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+        # The save command hands a snapshot to the shared writer instead of blocking the loop
+        self._session_writer = shared_writer()
+
+        # One pooled HTTP session keeps the TLS connection to Gemini alive between turns
+        self.session = _new_http_session()
+
         self.system_prompt = """You are a compassionate and wise spiritual guide specializing in helping people discover their spiritual gifts and life calling. You excel at asking thoughtful questions that help people connect their natural skills with their deepest passions and values."""
 
-    def call_gemini(self, prompt):
-        """Make API call to Gemini"""
-        payload = {
+        # The persona never changes, so it is sent as a separate system instruction
+        # built once here - a stable prefix the API can reuse across turns
+        self._system_instruction = {"parts": [{"text": self.system_prompt}]}
+
+        # Only the prompt text changes between requests, so the rest of the body is
+        # serialized once and the encoded prompt is spliced in between
+        template = dumps(self._build_payload(_PROMPT_SENTINEL))
+        encoded_sentinel = dumps(_PROMPT_SENTINEL)
+        assert template.count(encoded_sentinel) == 1, "prompt sentinel must appear exactly once"
+        self._body_prefix, self._body_suffix = template.split(encoded_sentinel)
+
+        # Interactive commands, keyed by their lowercase form
+        self._commands = {
+            "quit": self._cmd_quit,
+            "exit": self._cmd_quit,
+            "bye": self._cmd_quit,
+            "save": self._cmd_save,
+            "progress": self._cmd_progress,
+            "skip": self._cmd_skip
+        }
+        self._max_command_length = max(len(name) for name in self._commands)
+
+    def _build_payload(self, prompt):
+        """Build the generateContent request body for a prompt"""
+        return {
+            "systemInstruction": self._system_instruction,
             "contents": [{
                 "parts": [{
                     "text": prompt
@@ -257,25 +431,192 @@ class DiscoveryBot:
             }]
         }
 
-        headers = {"Content-Type": "application/json"}
+    def _build_body(self, prompt):
+        """Serialize the request body for a prompt without re-encoding the static parts"""
+        return self._body_prefix + dumps(prompt) + self._body_suffix
+
+    @staticmethod
+    def _extract_text(data):
+        """Pull the generated text out of a Gemini response body (None if absent)"""
+        # Well-formed responses take the direct path; any missing level falls through
+        try:
+            return data['candidates'][0]['content']['parts'][0]['text']
+        except (KeyError, IndexError, TypeError):
+            return None
+
+    def _cached_response(self, prompt, query):
+        """Return a cached response for this prompt, if caching is enabled"""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get(prompt, query)
 
+    def _embed_in_background(self, query):
+        """Start embedding the query for the cache so it overlaps the network call"""
+        if self.response_cache is None or not query:
+            return None
+        return self._executor.submit(self.response_cache.embed, query)
+
+    def _cache_response(self, prompt, text, query, embedding_future=None):
+        """Store a completed response, reusing the background embedding if there is one"""
+        if self.response_cache is not None:
+            embedding = embedding_future.result() if embedding_future else None
+            self.response_cache.put(prompt, text, query, embedding)
+
+    def call_gemini(self, prompt, query=None):
+        """
+        Make API call to Gemini
+
+        Architecture Concept: With caching enabled, responses are stored on disk.
+        Identical prompts are answered locally, and so are rewordings of `query` (the
+        user's words inside the prompt) when the rest of the prompt matches.
+        """
+        cached_response = self._cached_response(prompt, query)
+        if cached_response is not None:
+            return cached_response
+
+        embedding_future = self._embed_in_background(query)
+        text, failure = self._request_text(self.session, prompt)
+        if text is None:
+            return failure
+
+        self._cache_response(prompt, text, query, embedding_future)
+        return text
+
+    def _request_text(self, session, prompt):
+        """
+        Send one generateContent request on the given session
+
+        Returns (text, None) on success, or (None, message to show the user) on failure.
+        """
         try:
-            response = requests.post(self.api_url, headers=headers, data=json.dumps(payload))
+            response = session.post(self.api_url, data=self._build_body(prompt), timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
 
-            data = response.json()
-            if 'candidates' in data and len(data['candidates']) > 0:
-                if 'content' in data['candidates'][0]:
-                    parts = data['candidates'][0]['content']['parts']
-                    if len(parts) > 0 and 'text' in parts[0]:
-                        return parts[0]['text']
+            text = self._extract_text(loads(response.content))
+            if text is not None:
+                return text, None
+
+            return None, "Sorry, I couldn't generate a response."
 
-            return "Sorry, I couldn't generate a response."
+        except requests.exceptions.RequestException as e:
+            return None, f"Error calling API: {e}"
+        except (KeyError, ValueError) as e:
+            return None, f"Error parsing response: {e}"
+
+    def _request_text_on_own_session(self, prompt):
+        """_request_text on a short-lived session, for calls made from worker threads"""
+        with _new_http_session() as session:
+            return self._request_text(session, prompt)
+
+    def call_gemini_stream(self, prompt, query=None):
+        """
+        Stream a Gemini response, yielding text chunks as they arrive
+
+        Architecture Concept: Server-sent events let the first words print while the
+        rest of the response is still being generated. Only complete responses are cached.
+        """
+        cached_response = self._cached_response(prompt, query)
+        if cached_response is not None:
+            yield cached_response
+            return
+
+        embedding_future = self._embed_in_background(query)
+        chunks = []
+        try:
+            with self.session.post(self.stream_url, data=self._build_body(prompt), stream=True, timeout=_REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+                    text = self._extract_text(loads(line[len(b"data: "):]))
+                    if text:
+                        chunks.append(text)
+                        yield text
 
         except requests.exceptions.RequestException as e:
-            return f"Error calling API: {e}"
-        except KeyError as e:
-            return f"Error parsing response: {e}"
+            yield f"Error calling API: {e}"
+            return
+        except (KeyError, ValueError) as e:
+            yield f"Error parsing response: {e}"
+            return
+
+        if chunks:
+            self._cache_response(prompt, "".join(chunks), query, embedding_future)
+        else:
+            yield "Sorry, I couldn't generate a response."
+
+    def close(self):
+        """Write any queued save, then release pooled HTTP connections and worker threads"""
+        self._session_writer.flush()
+        self.session.close()
+        self._executor.shutdown(wait=False)
+
+    async def acall_gemini(self, prompt, query=None):
+        """
+        Async version of call_gemini
+
+        Architecture Concept: Only the blocking HTTP call runs on a worker thread, so
+        independent prompts can be in flight together via asyncio.gather. Each call gets
+        its own session - requests.Session is not shared across threads - and the cache
+        is read and written here, on the event loop's thread.
+        """
+        import asyncio  # only the async helper needs it - keeps module import light
+
+        cached_response = self._cached_response(prompt, query)
+        if cached_response is not None:
+            return cached_response
+
+        loop = asyncio.get_running_loop()
+        text, failure = await loop.run_in_executor(None, self._request_text_on_own_session, prompt)
+        if text is None:
+            return failure
+
+        self._cache_response(prompt, text, query)
+        return text
+
+    def _save_session(self, wait=False):
+        """Queue a snapshot of the session for the background writer"""
+        session = self.discovery_session
+        filename = session.session_filename()
+        ensure_directory(os.path.dirname(filename))
+        self._session_writer.submit(filename, session.snapshot())
+        if wait:
+            self._session_writer.flush()
+        return filename
+
+    def _cmd_quit(self):
+        """Save and end the journey (returns True to stop the loop)"""
+        filename = self._save_session(wait=True)
+        print(f"\nGuide: Your discovery journey has been saved to {filename}")
+        print("Take time to reflect on what we've explored. Your path continues to unfold! 🙏")
+        return True
+
+    def _cmd_save(self):
+        """Save the session in the background and keep going"""
+        filename = self._save_session()
+        print(f"\nSession save queued: {filename}")
+
+    def _cmd_progress(self):
+        """Show how far through the stages the user is"""
+        summary = self.discovery_session.get_session_summary()
+        current_stage = summary["current_stage"]
+        completion = summary["completion_percentage"]
+        print(f"\n--- Discovery Progress ---")
+        print(f"Current Stage: {current_stage.title()}")
+        print(f"Overall Progress: {completion:.1f}%")
+        print(f"Total Responses: {summary['total_responses']}")
+        print("--- End Progress ---")
+
+    def _cmd_skip(self):
+        """Jump to the next stage"""
+        print("\nSkipping to next stage...")
+        self.discovery_session._advance_to_next_stage()
+        next_question = self.discovery_session.get_next_question()
+        if next_question:
+            print(f"\nGuide: {next_question}")
+        else:
+            print("\nGuide: We've completed all discovery stages!")
 
     def start_discovery_journey(self):
         """Begin the structured discovery conversation"""
@@ -296,41 +637,17 @@ class DiscoveryBot:
         while True:
             user_input = input("\nYou: ").strip()
 
-            if user_input.lower() in ['quit', 'exit', 'bye']:
-                filename = self.discovery_session.save_session()
-                print(f"\nGuide: Your discovery journey has been saved to {filename}")
-                print("Take time to reflect on what we've explored. Your path continues to unfold! 🙏")
-                break
-
-            if user_input.lower() == 'save':
-                filename = self.discovery_session.save_session()
-                print(f"\nSession saved to {filename}")
-                continue
-
-            if user_input.lower() == 'progress':
-                summary = self.discovery_session.get_session_summary()
-                current_stage = summary["current_stage"]
-                completion = summary["completion_percentage"]
-                print(f"\n--- Discovery Progress ---")
-                print(f"Current Stage: {current_stage.title()}")
-                print(f"Overall Progress: {completion:.1f}%")
-                print(f"Total Responses: {summary['total_responses']}")
-                print("--- End Progress ---")
-                continue
-
-            if user_input.lower() == 'skip':
-                print("\nSkipping to next stage...")
-                self.discovery_session._advance_to_next_stage()
-                next_question = self.discovery_session.get_next_question()
-                if next_question:
-                    print(f"\nGuide: {next_question}")
-                else:
-                    print("\nGuide: We've completed all discovery stages!")
-                continue
-
             if not user_input:
                 continue
 
+            # Commands are short, so only short inputs need lowercasing and a table lookup
+            if len(user_input) <= self._max_command_length:
+                command = self._commands.get(user_input.lower())
+                if command:
+                    if command():
+                        break
+                    continue
+
             # Process the user's response
             success = self.discovery_session.process_response(user_input)
             if not success:
@@ -341,28 +658,42 @@ class DiscoveryBot:
             current_stage = self.discovery_session.get_current_stage()
             contextual_prompt = self.discovery_session.build_contextual_prompt(current_stage, user_input)
 
-            print("\nGuide: ", end="", flush=True)
-            ai_response = self.call_gemini(contextual_prompt)
-            print(ai_response)
-
-            # Get next question if we're still in progress
+            # The next question doesn't depend on the AI's reply, so the request is started
+            # on a worker thread (running until the first chunk arrives) and the question
+            # is picked while the network round trip is in flight
+            stream = self.call_gemini_stream(contextual_prompt, user_input)
+            first_chunk = self._executor.submit(next, stream, None)
             next_question = self.discovery_session.get_next_question()
+
+            print("\nGuide: ", end="", flush=True)
+            chunk = first_chunk.result()
+            if chunk is not None:
+                print(chunk, end="", flush=True)
+                for chunk in stream:
+                    print(chunk, end="", flush=True)
+            print()
+
+            # Show the next question if we're still in progress
             if next_question:
                 print(f"\nNext: {next_question}")
             else:
                 current_stage = self.discovery_session.get_current_stage()
                 if current_stage == "completed":
                     print("\n🎉 Congratulations! You've completed your spiritual discovery journey!")
-                    filename = self.discovery_session.save_session()
+                    filename = self._save_session(wait=True)
                     print(f"Your complete session has been saved to {filename}")
                     break
 
 
 if __name__ == "__main__":
+    bot = None
     try:
         bot = DiscoveryBot()
         bot.start_discovery_journey()
     except ValueError as e:
         print(f"Configuration error: {e}")
     except KeyboardInterrupt:
-        print("\nGoodbye!")
\ No newline at end of file
+        print("\nGoodbye!")
+    finally:
+        if bot:
+            bot.close()
\ No newline at end of file
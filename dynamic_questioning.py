@@ -10,12 +10,24 @@ Key Architecture Concepts:
 4. Coverage Tracking: Ensure comprehensive assessment despite dynamic flow
 """
 
-import json
-from typing import Dict, List, Optional, Tuple, Any
+import re
+import sys
+import heapq
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 
-class QuestionType(Enum):
+from keyword_automaton import KeywordAutomaton
+from json_storage import dumps_indented
+
+class QuestionType(str, Enum):
+    """
+    Kind of question asked
+
+    Members are strings themselves, so they compare equal to their values and
+    serialize to JSON without going through .value
+    """
     STANDARD = "standard"           # Predetermined questions
     FOLLOW_UP = "follow_up"         # Based on previous response
     DEEP_DIVE = "deep_dive"         # Explore emerging theme
@@ -25,6 +37,8 @@ class QuestionType(Enum):
 @dataclass
 class DynamicQuestion:
     """Represents a dynamically generated question"""
+    __slots__ = ('question_text', 'question_type', 'target_theme', 'reasoning', 'priority')
+
     question_text: str
     question_type: QuestionType
     target_theme: str
@@ -34,11 +48,93 @@ class DynamicQuestion:
 @dataclass
 class ResponsePattern:
     """Identified pattern in user responses"""
+    __slots__ = ('pattern_name', 'confidence', 'evidence', 'stage_first_seen', 'implications')
+
     pattern_name: str
     confidence: float
     evidence: List[str]
     stage_first_seen: str
-    implications: List[str]  # What this pattern suggests
+    implications: Tuple[str, ...]  # What this pattern suggests
+
+# Payload tags for the two kinds of terms in the shared keyword automaton
+_PATTERN_HIT = 0
+_THEME_HIT = 1
+
+# Punctuation that can separate the words of a phrase; none of the rule terms contain it
+_PUNCT_TO_SPACE = str.maketrans({char: ' ' for char in '.,;:!?()"\''})
+
+def _normalize(text: str) -> str:
+    """Lowercase text, turn punctuation into spaces and collapse runs of whitespace"""
+    return ' '.join(text.lower().translate(_PUNCT_TO_SPACE).split())
+
+# What each pattern suggests exploring next - shared, immutable, built once
+_PATTERN_IMPLICATIONS: Dict[str, Tuple[str, ...]] = {
+    'strong_teaching_indicators': (
+        'Explore specific teaching experiences',
+        'Ask about satisfaction from others learning',
+        'Investigate formal vs informal teaching preferences'
+    ),
+    'leadership_emergence': (
+        'Explore vision-casting experiences',
+        'Ask about team dynamics and motivation',
+        'Investigate leadership style preferences'
+    ),
+    'service_orientation': (
+        'Explore behind-the-scenes contributions',
+        'Ask about satisfaction from supporting others',
+        'Investigate preferred ways to help'
+    ),
+    'creative_expression': (
+        'Explore artistic outlets and mediums',
+        'Ask about role of beauty in life',
+        'Investigate creative problem-solving'
+    ),
+    'justice_passion': (
+        'Explore specific justice issues that matter',
+        'Ask about advocacy experiences',
+        'Investigate ways they want to create change'
+    )
+}
+
+# Deep-dive questions per pattern, asked in order
+_DEEP_DIVE_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    'strong_teaching_indicators': (
+        "You've mentioned teaching/explaining several times - can you tell me about a specific time when you helped someone understand something complex?",
+        "It sounds like you have a natural teaching gift. What do you find most rewarding about helping others learn?",
+        "When you're explaining something to someone, what approach do you naturally take?"
+    ),
+    'leadership_emergence': (
+        "I notice leadership themes in what you're sharing. Can you describe a time when you naturally took charge of a situation?",
+        "What happens when you're in a group and no clear direction exists?",
+        "How do you typically motivate or inspire others?"
+    ),
+    'service_orientation': (
+        "You seem drawn to supporting and helping others. What's your favorite way to serve?",
+        "Tell me about a time when you helped someone succeed - what was that like for you?",
+        "Do you prefer to help from behind the scenes or more visibly?"
+    )
+}
+
+# Fallback question per stage
+_STANDARD_QUESTIONS: Dict[str, str] = {
+    'introduction': "Tell me what brought you here to explore your spiritual gifts today?",
+    'skills_assessment': "What's something you do that others find difficult but comes naturally to you?",
+    'passion_exploration': "What activities or causes make you feel most alive and engaged?",
+    'values_clarification': "What principles or values guide your most important decisions?"
+}
+
+# Minimum responses per stage
+_MIN_STAGE_RESPONSES: Dict[str, int] = {
+    'introduction': 1, 'skills_assessment': 2, 'passion_exploration': 2, 'values_clarification': 1
+}
+
+# Questions that connect the patterns discovered so far
+_SYNTHESIS_QUESTIONS: Tuple[str, ...] = (
+    "Looking at what you've shared about your strengths and passions, where do you see the strongest connections?",
+    "What patterns are you noticing about what energizes you and what you're naturally good at?",
+    "If you could design a role that perfectly combined your gifts and passions, what would it look like?",
+    "How do you think your natural abilities could serve your deepest passions?"
+)
 
 class DynamicQuestioningEngine:
     """
@@ -51,8 +147,149 @@ class DynamicQuestioningEngine:
     - Maintains assessment coverage
     """
 
+    # Pattern detection rules
+    pattern_rules = {
+        'strong_teaching_indicators': {
+            'keywords': ['teach', 'explain', 'mentor', 'guide', 'help others learn', 'break down'],
+            'phrases': ['people come to me', 'i love helping others understand', 'explaining'],
+            'threshold': 0.7
+        },
+        'leadership_emergence': {
+            'keywords': ['lead', 'organize', 'vision', 'inspire', 'motivate others', 'take charge'],
+            'phrases': ['others follow', 'i see the big picture', 'rally people'],
+            'threshold': 0.7
+        },
+        'service_orientation': {
+            'keywords': ['serve', 'help', 'support', 'care', 'assist', 'come alongside'],
+            'phrases': ['behind the scenes', 'prefer to support', 'help others succeed'],
+            'threshold': 0.6
+        },
+        'creative_expression': {
+            'keywords': ['create', 'design', 'artistic', 'beauty', 'express', 'imagine'],
+            'phrases': ['creative outlet', 'artistic expression', 'beauty matters'],
+            'threshold': 0.6
+        },
+        'justice_passion': {
+            'keywords': ['justice', 'fair', 'equality', 'advocate', 'stand up', 'rights'],
+            'phrases': ['not fair', 'speak up for', 'injustice bothers me'],
+            'threshold': 0.7
+        }
+    }
+
+    # Follow-up triggers, in priority order
+    follow_up_rules = [
+        {
+            'triggers': ['i love', 'passionate about', 'deeply care'],
+            'question': "What specifically about that resonates so deeply with you?",
+            'reasoning': "User expressed strong passion"
+        },
+        {
+            'triggers': ['difficult', 'challenging', 'struggle with'],
+            'question': "Even though it's challenging, what draws you to persist with it?",
+            'reasoning': "User mentioned difficulty but continued engagement"
+        },
+        {
+            'triggers': ['people come to me', 'others seek me out', 'friends ask me'],
+            'question': "What do you think it is about you that makes people naturally turn to you for this?",
+            'reasoning': "User mentioned others recognizing their ability"
+        },
+        {
+            'triggers': ['started', 'began', 'initiated'],
+            'question': "What motivated you to take that first step?",
+            'reasoning': "User mentioned taking initiative"
+        }
+    ]
+
+    # Words that show a coverage area has come up
+    theme_indicators = {
+        'natural_abilities': ['good at', 'excel', 'talented', 'naturally', 'easily'],
+        'energy_sources': ['energizes', 'love', 'enjoy', 'alive', 'passionate'],
+        'core_values': ['value', 'important', 'principle', 'believe', 'matters'],
+        'impact_desires': ['difference', 'change', 'help', 'impact', 'legacy']
+    }
+
+    @classmethod
+    def _build_tables(cls):
+        """
+        Compile the pattern rules into a single keyword automaton and the
+        follow-up triggers into a single regex
+
+        Architecture Concept: The rules never change, so everything compiled from
+        them is built once per process and shared by every engine instance. Terms
+        are lowercased here, once, to match the normalized responses.
+        """
+        # Every keyword and phrase becomes a trie terminal carrying its contribution:
+        # (_PATTERN_HIT, rule, position within the rule, evidence label, 1 if it is a phrase)
+        automaton = KeywordAutomaton()
+        for rule_index, rules in enumerate(cls.pattern_rules.values()):
+            contributions = [(keyword, f"Mentioned: {keyword}", 0) for keyword in rules['keywords']]
+            contributions += [(phrase, f"Said: {phrase}", 1) for phrase in rules['phrases']]
+            for term_index, (term, label, is_phrase) in enumerate(contributions):
+                automaton.add_keyword(term.lower(), (_PATTERN_HIT, rule_index, term_index, label, is_phrase))
+
+        # Theme indicators share the automaton, tagged with their coverage area's bit,
+        # so the same pass that detects patterns also tracks coverage
+        cls._theme_bits = {theme: 1 << index for index, theme in enumerate(cls.theme_indicators)}
+        for theme, indicators in cls.theme_indicators.items():
+            for indicator in indicators:
+                automaton.add_keyword(indicator.lower(), (_THEME_HIT, cls._theme_bits[theme]))
+        automaton.build()
+        cls._pattern_automaton = automaton
+
+        # Partially evaluate the payloads: every state where terms end is folded into
+        # what reaching it means - the theme bits it covers and the (rule, hit) pairs
+        # it contributes - so ingestion applies one precomputed effect per state
+        cls._state_effects = {}
+        for state, matches in automaton.match_states():
+            theme_mask = 0
+            rule_hits = []
+            for _, payload in matches:
+                if payload[0] == _THEME_HIT:
+                    theme_mask |= payload[1]
+                else:
+                    rule_hits.append((payload[1], payload[2:]))
+            cls._state_effects[state] = (theme_mask, tuple(rule_hits))
+
+        # A rule's outcome depends only on how many of its keywords and phrases were
+        # found, so it is decided up front for every count:
+        # _firing_confidence[rule][keywords][phrases] is the confidence if the rule
+        # fires, None if it stays below its threshold. Scores are accumulated exactly
+        # as the rules score (0.2 per keyword, then 0.3 per phrase, capped at 1.0).
+        cls._rule_names = tuple(cls.pattern_rules)
+        cls._firing_confidence = []
+        for rules in cls.pattern_rules.values():
+            table = []
+            for keyword_count in range(len(rules['keywords']) + 1):
+                row = []
+                for phrase_count in range(len(rules['phrases']) + 1):
+                    score = 0
+                    for _ in range(keyword_count):
+                        score += 0.2
+                    for _ in range(phrase_count):
+                        score += 0.3
+                    confidence = min(score, 1.0)
+                    row.append(confidence if confidence >= rules['threshold'] else None)
+                table.append(row)
+            cls._firing_confidence.append(table)
+
+        # All follow-up triggers in one regex: each alternative is a lookahead over the
+        # whole response, tried in rule order, so the first rule with any trigger
+        # matches regardless of where in the text its trigger appears
+        cls._follow_up_re = re.compile('|'.join(
+            f"(?=.*?(?:{'|'.join(re.escape(trigger.lower()) for trigger in rule['triggers'])}))(?P<rule{index}>)"
+            for index, rule in enumerate(cls.follow_up_rules)
+        ), re.DOTALL)
+
     def __init__(self):
         self.response_patterns: List[ResponsePattern] = []
+
+        # Running statistics over response_patterns, updated as patterns are appended:
+        # counts at the two confidence thresholds we check, and a size-3 min-heap of
+        # (confidence, -index) holding the strongest patterns (earliest wins ties)
+        self._mid_confidence_count = 0   # confidence >= 0.7
+        self._high_confidence_count = 0  # confidence >= 0.8
+        self._strongest_patterns: List[Tuple[float, int]] = []
+
         self.coverage_requirements: Dict[str, List[str]] = self._define_coverage_requirements()
         self.coverage_status: Dict[str, bool] = {area: False for area in self.coverage_requirements}
         self.dynamic_questions_asked: List[DynamicQuestion] = []
@@ -62,6 +299,27 @@ class DynamicQuestioningEngine:
         self.max_follow_ups = 2       # Max follow-up questions per theme
         self.deep_dive_threshold = 0.8 # When to suggest deep exploration
 
+        # Next deep-dive template to ask, per pattern
+        self._asked_template_index: Dict[str, int] = defaultdict(int)
+
+        # Incremental scan of the responses: the dict and (stage, responses list, count)
+        # layout last ingested, how many responses that covered, and the automaton
+        # state the transcript ended in
+        self._ingested_source: Optional[Dict[str, List[Dict]]] = None
+        self._ingested_stages: List[Tuple[str, List[Dict], int]] = []
+        self._ingested_count = 0
+        self._scan_state = 0
+
+        # Accumulated scan results: pattern term hits per rule and the bitmap of
+        # covered theme areas
+        self._rule_hits: Dict[int, Set[Tuple[int, str, int]]] = {}
+        self._covered_bits = 0
+
+        # The most recent response ingested and its normalized form,
+        # so the follow-up check can reuse it instead of normalizing again
+        self._last_response = ""
+        self._last_response_normalized = ""
+
     def _define_coverage_requirements(self) -> Dict[str, List[str]]:
         """
         Define minimum coverage areas for comprehensive assessment
@@ -99,106 +357,116 @@ class DynamicQuestioningEngine:
         """
         patterns = []
 
-        # Collect all responses as text
-        all_responses = []
-        for stage_responses in user_responses.values():
-            for response_obj in stage_responses:
-                all_responses.append(response_obj.get('response', ''))
-
-        response_text = ' '.join(all_responses).lower()
-
-        # Pattern detection rules
-        pattern_rules = {
-            'strong_teaching_indicators': {
-                'keywords': ['teach', 'explain', 'mentor', 'guide', 'help others learn', 'break down'],
-                'phrases': ['people come to me', 'i love helping others understand', 'explaining'],
-                'threshold': 0.7
-            },
-            'leadership_emergence': {
-                'keywords': ['lead', 'organize', 'vision', 'inspire', 'motivate others', 'take charge'],
-                'phrases': ['others follow', 'i see the big picture', 'rally people'],
-                'threshold': 0.7
-            },
-            'service_orientation': {
-                'keywords': ['serve', 'help', 'support', 'care', 'assist', 'come alongside'],
-                'phrases': ['behind the scenes', 'prefer to support', 'help others succeed'],
-                'threshold': 0.6
-            },
-            'creative_expression': {
-                'keywords': ['create', 'design', 'artistic', 'beauty', 'express', 'imagine'],
-                'phrases': ['creative outlet', 'artistic expression', 'beauty matters'],
-                'threshold': 0.6
-            },
-            'justice_passion': {
-                'keywords': ['justice', 'fair', 'equality', 'advocate', 'stand up', 'rights'],
-                'phrases': ['not fair', 'speak up for', 'injustice bothers me'],
-                'threshold': 0.7
-            }
-        }
-
-        for pattern_name, rules in pattern_rules.items():
-            evidence = []
-            score = 0
+        # Only responses not seen before are scanned
+        contributions = self._ingest_responses(user_responses)
 
-            # Check keywords
-            for keyword in rules['keywords']:
-                if keyword in response_text:
-                    evidence.append(f"Mentioned: {keyword}")
-                    score += 0.2
+        # Only rules with at least one hit are visited, in rule order
+        for rule_index in sorted(contributions):
+            rule_hits = contributions[rule_index]
 
-            # Check phrases
-            for phrase in rules['phrases']:
-                if phrase in response_text:
-                    evidence.append(f"Said: {phrase}")
-                    score += 0.3
+            # Whether it fires, and how strongly, is a table lookup on the hit counts
+            phrase_count = sum(is_phrase for _, _, is_phrase in rule_hits)
+            confidence = self._firing_confidence[rule_index][len(rule_hits) - phrase_count][phrase_count]
 
-            # Normalize score
-            confidence = min(score, 1.0)
-
-            if confidence >= rules['threshold'] and evidence:
+            if confidence is not None:
+                pattern_name = self._rule_names[rule_index]
+                # Keywords come before phrases, each in rule order
+                evidence = [label for _, label, _ in sorted(rule_hits)]
                 pattern = ResponsePattern(
                     pattern_name=pattern_name,
                     confidence=confidence,
                     evidence=evidence,
-                    stage_first_seen=current_stage,
+                    stage_first_seen=sys.intern(current_stage),
                     implications=self._get_pattern_implications(pattern_name)
                 )
                 patterns.append(pattern)
 
         # Update stored patterns
-        self.response_patterns.extend(patterns)
+        for pattern in patterns:
+            confidence = pattern.confidence
+            self._mid_confidence_count += confidence >= 0.7
+            self._high_confidence_count += confidence >= 0.8
+
+            entry = (confidence, -len(self.response_patterns))
+            if len(self._strongest_patterns) < 3:
+                heapq.heappush(self._strongest_patterns, entry)
+            else:
+                heapq.heappushpop(self._strongest_patterns, entry)
+
+            self.response_patterns.append(pattern)
         return patterns
 
-    def _get_pattern_implications(self, pattern_name: str) -> List[str]:
+    def _ingest_responses(self, user_responses: Dict[str, List[Dict]]) -> Dict[int, Set[Tuple[int, str, int]]]:
+        """
+        Scan any responses not seen before for pattern terms and theme indicators
+
+        Returns every (position, evidence label, is_phrase) hit found so far, keyed by
+        the index of each rule that has any, and keeps the covered-theme bitmap current.
+
+        Architecture Concept: Responses are only ever appended, so when the same
+        responses dict comes back with new answers at the end of the transcript, only
+        those are normalized and scanned - resuming the automaton where the previous
+        scan stopped, so the hits are exactly those of the whole transcript.
+        Any other change starts over from the first response.
+        """
+        stages = [(stage, responses, len(responses)) for stage, responses in user_responses.items()]
+        cached = self._ingested_stages
+
+        # Skip the stages whose responses are exactly as last time
+        first_change = 0
+        if user_responses is self._ingested_source:
+            for (stage, responses, count), (new_stage, new_responses, new_count) in zip(cached, stages):
+                if new_stage != stage or new_responses is not responses or new_count != count:
+                    break
+                first_change += 1
+
+        # New text continues the transcript if nothing after the changed stage had
+        # responses and the changed stage itself only grew
+        start, offset = None, 0
+        if user_responses is self._ingested_source and not any(count for _, _, count in cached[first_change + 1:]):
+            if first_change >= len(cached) or cached[first_change][2] == 0:
+                start = first_change
+            elif (first_change < len(stages)
+                  and stages[first_change][0] == cached[first_change][0]
+                  and stages[first_change][1] is cached[first_change][1]
+                  and stages[first_change][2] > cached[first_change][2]):
+                start, offset = first_change, cached[first_change][2]
+
+        if start is None:
+            start, offset = 0, 0
+            self._ingested_count = 0
+            self._scan_state = 0
+            self._rule_hits = {}
+            self._covered_bits = 0
+
+        new_texts = [
+            response_obj.get('response', '')
+            for index, (_, responses, _) in enumerate(stages[start:])
+            for response_obj in (responses[offset:] if index == 0 else responses)
+        ]
+        if new_texts:
+            normalized = [_normalize(text) for text in new_texts]
+            added = ' '.join(normalized)
+            if self._ingested_count:
+                added = ' ' + added
+            self._ingested_count += len(new_texts)
+            self._last_response, self._last_response_normalized = new_texts[-1], normalized[-1]
+
+            states, self._scan_state = self._pattern_automaton.resume_states(added, self._scan_state)
+            state_effects = self._state_effects
+            for state in states:
+                theme_mask, rule_hits = state_effects[state]
+                self._covered_bits |= theme_mask
+                for rule_index, hit in rule_hits:
+                    self._rule_hits.setdefault(rule_index, set()).add(hit)
+
+        self._ingested_source = user_responses
+        self._ingested_stages = stages
+        return self._rule_hits
+
+    def _get_pattern_implications(self, pattern_name: str) -> Tuple[str, ...]:
         """Get implications of identified patterns for question generation"""
-        implications_map = {
-            'strong_teaching_indicators': [
-                'Explore specific teaching experiences',
-                'Ask about satisfaction from others learning',
-                'Investigate formal vs informal teaching preferences'
-            ],
-            'leadership_emergence': [
-                'Explore vision-casting experiences',
-                'Ask about team dynamics and motivation',
-                'Investigate leadership style preferences'
-            ],
-            'service_orientation': [
-                'Explore behind-the-scenes contributions',
-                'Ask about satisfaction from supporting others',
-                'Investigate preferred ways to help'
-            ],
-            'creative_expression': [
-                'Explore artistic outlets and mediums',
-                'Ask about role of beauty in life',
-                'Investigate creative problem-solving'
-            ],
-            'justice_passion': [
-                'Explore specific justice issues that matter',
-                'Ask about advocacy experiences',
-                'Investigate ways they want to create change'
-            ]
-        }
-        return implications_map.get(pattern_name, [])
+        return _PATTERN_IMPLICATIONS.get(pattern_name, ())
 
     def generate_next_question(self, user_responses: Dict, current_stage: str, last_response: str) -> DynamicQuestion:
         """
@@ -207,6 +475,9 @@ class DynamicQuestioningEngine:
         Architecture Concept: Adaptive Question Generation
         """
 
+        # Stage names become dict keys and question themes - share one interned copy
+        current_stage = sys.intern(current_stage)
+
         # Analyze current patterns
         new_patterns = self.analyze_response_patterns(user_responses, current_stage)
 
@@ -228,7 +499,7 @@ class DynamicQuestioningEngine:
             return self._generate_coverage_question(uncovered_area)
 
         # Generate synthesis question if patterns are strong
-        if len([p for p in self.response_patterns if p.confidence >= 0.7]) >= 2:
+        if self._mid_confidence_count >= 2:
             return self._generate_synthesis_question()
 
         # Default to standard stage question
@@ -237,30 +508,15 @@ class DynamicQuestioningEngine:
     def _generate_deep_dive_question(self, pattern: ResponsePattern, last_response: str) -> Optional[DynamicQuestion]:
         """Generate questions to explore strong patterns more deeply"""
 
-        deep_dive_templates = {
-            'strong_teaching_indicators': [
-                "You've mentioned teaching/explaining several times - can you tell me about a specific time when you helped someone understand something complex?",
-                "It sounds like you have a natural teaching gift. What do you find most rewarding about helping others learn?",
-                "When you're explaining something to someone, what approach do you naturally take?"
-            ],
-            'leadership_emergence': [
-                "I notice leadership themes in what you're sharing. Can you describe a time when you naturally took charge of a situation?",
-                "What happens when you're in a group and no clear direction exists?",
-                "How do you typically motivate or inspire others?"
-            ],
-            'service_orientation': [
-                "You seem drawn to supporting and helping others. What's your favorite way to serve?",
-                "Tell me about a time when you helped someone succeed - what was that like for you?",
-                "Do you prefer to help from behind the scenes or more visibly?"
-            ]
-        }
+        templates = _DEEP_DIVE_TEMPLATES.get(pattern.pattern_name, ())
 
-        templates = deep_dive_templates.get(pattern.pattern_name, [])
-        if not templates:
+        # Rotate through the templates not yet asked for this pattern, up to the
+        # per-theme follow-up limit
+        index = self._asked_template_index[pattern.pattern_name]
+        if index >= min(len(templates), self.max_follow_ups):
             return None
-
-        # Choose template based on what hasn't been asked
-        template = templates[0]  # Simplified selection
+        template = templates[index]
+        self._asked_template_index[pattern.pattern_name] = index + 1
 
         return DynamicQuestion(
             question_text=template,
@@ -273,70 +529,36 @@ class DynamicQuestioningEngine:
     def _generate_follow_up_question(self, last_response: str, stage: str) -> Optional[DynamicQuestion]:
         """Generate contextual follow-up based on immediate response"""
 
-        response_lower = last_response.lower()
-
-        # Follow-up triggers
-        follow_up_rules = [
-            {
-                'triggers': ['i love', 'passionate about', 'deeply care'],
-                'question': "What specifically about that resonates so deeply with you?",
-                'reasoning': "User expressed strong passion"
-            },
-            {
-                'triggers': ['difficult', 'challenging', 'struggle with'],
-                'question': "Even though it's challenging, what draws you to persist with it?",
-                'reasoning': "User mentioned difficulty but continued engagement"
-            },
-            {
-                'triggers': ['people come to me', 'others seek me out', 'friends ask me'],
-                'question': "What do you think it is about you that makes people naturally turn to you for this?",
-                'reasoning': "User mentioned others recognizing their ability"
-            },
-            {
-                'triggers': ['started', 'began', 'initiated'],
-                'question': "What motivated you to take that first step?",
-                'reasoning': "User mentioned taking initiative"
-            }
-        ]
-
-        for rule in follow_up_rules:
-            if any(trigger in response_lower for trigger in rule['triggers']):
-                return DynamicQuestion(
-                    question_text=rule['question'],
-                    question_type=QuestionType.FOLLOW_UP,
-                    target_theme=stage,
-                    reasoning=rule['reasoning'],
-                    priority=0.7
-                )
+        # Normally the response was just normalized into the corpus
+        if last_response == self._last_response:
+            response_normalized = self._last_response_normalized
+        else:
+            response_normalized = _normalize(last_response)
+
+        # The first rule with a trigger anywhere in the response wins
+        match = self._follow_up_re.match(response_normalized)
+        if match:
+            rule = self.follow_up_rules[int(match.lastgroup[len('rule'):])]
+            return DynamicQuestion(
+                question_text=rule['question'],
+                question_type=QuestionType.FOLLOW_UP,
+                target_theme=stage,
+                reasoning=rule['reasoning'],
+                priority=0.7
+            )
 
         return None
 
     def _find_uncovered_area(self, user_responses: Dict) -> Optional[str]:
         """Find areas that haven't been adequately covered"""
 
-        # Simple coverage check - in production would be more sophisticated
-        covered_themes = set()
-        all_text = ' '.join([
-            resp.get('response', '')
-            for stage_responses in user_responses.values()
-            for resp in stage_responses
-        ]).lower()
-
-        # Check what themes are covered
-        theme_indicators = {
-            'natural_abilities': ['good at', 'excel', 'talented', 'naturally', 'easily'],
-            'energy_sources': ['energizes', 'love', 'enjoy', 'alive', 'passionate'],
-            'core_values': ['value', 'important', 'principle', 'believe', 'matters'],
-            'impact_desires': ['difference', 'change', 'help', 'impact', 'legacy']
-        }
-
-        for theme, indicators in theme_indicators.items():
-            if any(indicator in all_text for indicator in indicators):
-                covered_themes.add(theme)
+        # Simple coverage check - in production would be more sophisticated.
+        # Usually a no-op: the pattern analysis has already ingested these responses.
+        self._ingest_responses(user_responses)
 
         # Return first uncovered area
         for area in self.coverage_requirements:
-            if area not in covered_themes:
+            if not self._covered_bits & self._theme_bits.get(area, 0):
                 return area
 
         return None
@@ -356,15 +578,8 @@ class DynamicQuestioningEngine:
     def _generate_synthesis_question(self) -> DynamicQuestion:
         """Generate question that helps connect discovered patterns"""
 
-        synthesis_questions = [
-            "Looking at what you've shared about your strengths and passions, where do you see the strongest connections?",
-            "What patterns are you noticing about what energizes you and what you're naturally good at?",
-            "If you could design a role that perfectly combined your gifts and passions, what would it look like?",
-            "How do you think your natural abilities could serve your deepest passions?"
-        ]
-
         return DynamicQuestion(
-            question_text=synthesis_questions[0],
+            question_text=_SYNTHESIS_QUESTIONS[0],
             question_type=QuestionType.SYNTHESIS,
             target_theme="pattern_connection",
             reasoning="Multiple strong patterns identified - time to synthesize",
@@ -374,14 +589,7 @@ class DynamicQuestioningEngine:
     def _generate_standard_question(self, stage: str) -> DynamicQuestion:
         """Fallback to standard stage-appropriate question"""
 
-        standard_questions = {
-            'introduction': "Tell me what brought you here to explore your spiritual gifts today?",
-            'skills_assessment': "What's something you do that others find difficult but comes naturally to you?",
-            'passion_exploration': "What activities or causes make you feel most alive and engaged?",
-            'values_clarification': "What principles or values guide your most important decisions?"
-        }
-
-        question = standard_questions.get(stage, "Tell me more about your experiences.")
+        question = _STANDARD_QUESTIONS.get(stage, "Tell me more about your experiences.")
 
         return DynamicQuestion(
             question_text=question,
@@ -398,32 +606,39 @@ class DynamicQuestioningEngine:
         Architecture Concept: Dynamic Stage Progression
         """
 
-        # Minimum responses per stage
-        min_responses = {'introduction': 1, 'skills_assessment': 2, 'passion_exploration': 2, 'values_clarification': 1}
-
-        if response_count < min_responses.get(stage, 1):
+        if response_count < _MIN_STAGE_RESPONSES.get(sys.intern(stage), 1):
             return True
 
         # Continue if we have strong patterns to explore
-        recent_patterns = [p for p in self.response_patterns if p.confidence >= 0.8]
-        if recent_patterns and response_count < 4:  # Max 4 per stage
+        if self._high_confidence_count and response_count < 4:  # Max 4 per stage
             return True
 
         return False
 
+    def high_confidence_pattern_count(self) -> int:
+        """Number of patterns identified with confidence >= 0.8, counted as they are added"""
+        return self._high_confidence_count
+
     def get_questioning_summary(self) -> Dict[str, Any]:
         """Get summary of dynamic questioning state"""
         return {
             "patterns_identified": len(self.response_patterns),
-            "high_confidence_patterns": len([p for p in self.response_patterns if p.confidence >= 0.8]),
+            "high_confidence_patterns": self._high_confidence_count,
             "dynamic_questions_asked": len(self.dynamic_questions_asked),
             "coverage_status": self.coverage_status,
             "strongest_patterns": [
-                {"name": p.pattern_name, "confidence": p.confidence}
-                for p in sorted(self.response_patterns, key=lambda x: x.confidence, reverse=True)[:3]
+                {"name": self.response_patterns[-negative_index].pattern_name, "confidence": confidence}
+                for confidence, negative_index in sorted(self._strongest_patterns, reverse=True)
             ]
         }
 
+    def to_json(self, summary: Optional[Dict[str, Any]] = None) -> str:
+        """Serialize a questioning summary (the current one by default) as indented JSON"""
+        return dumps_indented(summary if summary is not None else self.get_questioning_summary())
+
+
+DynamicQuestioningEngine._build_tables()
+
 
 if __name__ == "__main__":
     # Test the dynamic questioning engine
@@ -461,4 +676,4 @@ if __name__ == "__main__":
     print(f"  Priority: {next_question.priority}")
 
     print(f"\nQUESTIONING SUMMARY:")
-    print(json.dumps(engine.get_questioning_summary(), indent=2))
\ No newline at end of file
+    print(engine.to_json())
\ No newline at end of file
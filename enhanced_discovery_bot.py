@@ -11,23 +11,70 @@ Key Architecture Integration:
 """
 
 import os
-import json
 import requests
+from requests.adapters import HTTPAdapter
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
 from dotenv import load_dotenv
 
-# Import Phase 4 components
-from context_manager import EnhancedContextManager
-from dynamic_questioning import DynamicQuestioningEngine
-from personality_profiler import PersonalityProfiler
+from json_storage import dumps, loads, ensure_directory, shared_writer
 
-# Import Phase 3 components for compatibility
-from discovery_engine import DiscoverySession
-from scoring_system import SpiritualGiftsAssessment
+# Phase 3/4 components are imported when the bot is created (see __init__), so
+# importing this module stays cheap for code that never starts a session
+if TYPE_CHECKING:
+    from dynamic_questioning import DynamicQuestion
 
 # Load environment variables
 load_dotenv()
 
+# Seconds to wait for a connection to Gemini, then for each read of its response
+_REQUEST_TIMEOUT = (5, 30)
+
+# Unauthenticated host root, used only to open the pooled connection ahead of time
+_WARMUP_URL = "https://generativelanguage.googleapis.com/"
+
+# Inputs that end the conversation
+_EXIT_COMMANDS = frozenset({'quit', 'exit', 'bye'})
+
+# The guide's persona and standing instructions - the same on every turn, so they are
+# sent as the system instruction and only the per-turn guidance and context vary
+_GUIDE_SYSTEM_PROMPT = (
+    "You are a wise, compassionate spiritual guide helping someone discover their gifts and calling.\n\n"
+    "Respond naturally while following the style guidance. Reference previous insights when relevant. "
+    "Ask thoughtful follow-up questions that build on what you've learned about them."
+)
+
+# Fixed banners, built once and printed with a single call
+_WELCOME_BANNER = "\n".join([
+    "=" * 80,
+    "ENHANCED SPIRITUAL GIFTS DISCOVERY JOURNEY",
+    "=" * 80,
+    "Welcome to an intelligent, personalized spiritual gifts discovery experience!",
+    "\nThis enhanced system will:",
+    "  • Remember and reference your previous insights",
+    "  • Adapt questions based on patterns in your responses",
+    "  • Match my communication style to your preferences",
+    "  • Provide a truly personalized discovery journey",
+    "\nCommands: 'quit', 'save', 'progress', 'insights', 'style'",
+    "-" * 80,
+])
+
+_HELP_TEXT = "\n".join([
+    "\n--- ENHANCED HELP ---",
+    "Commands:",
+    "  'quit' - End session with intelligent summary",
+    "  'save' - Save enhanced session data",
+    "  'progress' - View progress with intelligence insights",
+    "  'insights' - Show discovered insights",
+    "  'style' - Show your communication style profile",
+    "  'help' - Show this help",
+    "\nThe enhanced system adapts to your communication style and",
+    "remembers insights throughout our conversation.",
+    "--- END HELP ---",
+])
+
 class EnhancedSpiritualDiscoveryBot:
     """
     Advanced AI chatbot with enhanced intelligence capabilities
@@ -45,6 +92,28 @@ class EnhancedSpiritualDiscoveryBot:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
 
         self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={self.api_key}"
+        self.stream_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:streamGenerateContent?alt=sse&key={self.api_key}"
+
+        # One pooled HTTP session keeps the TLS connection to Gemini alive between turns
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+        # Sent with every request ahead of the per-turn prompt
+        self._system_instruction = {"parts": [{"text": _GUIDE_SYSTEM_PROMPT}]}
+
+        # Runs the Gemini request while the next question is worked out locally
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        # Saves hand snapshots to the shared writer instead of blocking the chat loop
+        self._session_writer = shared_writer()
+
+        # Import Phase 4 components, plus Phase 3 components for compatibility
+        from context_manager import EnhancedContextManager
+        from dynamic_questioning import DynamicQuestioningEngine
+        from personality_profiler import PersonalityProfiler
+        from discovery_engine import DiscoverySession
+        from scoring_system import SpiritualGiftsAssessment
 
         # Initialize all intelligence systems
         self.context_manager = EnhancedContextManager()
@@ -60,9 +129,18 @@ class EnhancedSpiritualDiscoveryBot:
         self.session_start_time = datetime.now()
         self.total_exchanges = 0
 
-    def call_gemini_with_intelligence(self, user_input: str) -> str:
+        # Interactive commands besides the exit words, keyed by their lowercase form
+        self._commands = {
+            'save': self._save_enhanced_session,
+            'progress': self._show_enhanced_progress,
+            'insights': self._show_current_insights,
+            'style': self._show_personality_profile,
+            'help': self._show_enhanced_help
+        }
+
+    def _build_intelligent_payload(self, user_input: str) -> Dict:
         """
-        Enhanced LLM call with intelligent context and style adaptation
+        Build the request body for an intelligent LLM call
 
         Architecture Concept: Intelligent Prompt Engineering
         - Injects relevant context automatically
@@ -80,68 +158,108 @@ class EnhancedSpiritualDiscoveryBot:
         contextual_guidance = self.context_manager.get_contextual_guidance(self.conversation_stage)
 
         # Build enhanced prompt
-        enhanced_prompt = f"""You are a wise, compassionate spiritual guide helping someone discover their gifts and calling.
-
-{style_guidance}
+        enhanced_prompt = f"""{style_guidance}
 
 {contextual_guidance}
 
 CONVERSATION CONTEXT:
 {context}
 
-Respond naturally while following the style guidance. Reference previous insights when relevant. Ask thoughtful follow-up questions that build on what you've learned about them.
-
 Your response:"""
 
-        # Make API call
-        payload = {
+        return {
+            "systemInstruction": self._system_instruction,
             "contents": [{
+                "role": "user",
                 "parts": [{
                     "text": enhanced_prompt
                 }]
             }]
         }
 
-        headers = {"Content-Type": "application/json"}
+    @staticmethod
+    def _extract_text(data) -> Optional[str]:
+        """Pull the generated text out of a Gemini response body (None if absent)"""
+        try:
+            return data['candidates'][0]['content']['parts'][0]['text']
+        except (KeyError, IndexError, TypeError):
+            return None
+
+    def call_gemini_with_intelligence(self, user_input: str) -> str:
+        """Enhanced LLM call with intelligent context and style adaptation"""
+        payload = self._build_intelligent_payload(user_input)
 
         try:
-            response = requests.post(self.api_url, headers=headers, data=json.dumps(payload))
+            response = self.session.post(self.api_url, data=dumps(payload), timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
 
-            data = response.json()
-            if 'candidates' in data and len(data['candidates']) > 0:
-                if 'content' in data['candidates'][0]:
-                    parts = data['candidates'][0]['content']['parts']
-                    if len(parts) > 0 and 'text' in parts[0]:
-                        return parts[0]['text']
+            text = self._extract_text(loads(response.content))
+            if text is not None:
+                return text
 
             return "I'm having trouble generating a response. Could you share more about what you're experiencing?"
 
         except requests.exceptions.RequestException as e:
             return f"I'm experiencing a connection issue. Let's continue - could you tell me more?"
-        except KeyError as e:
+        except (KeyError, ValueError) as e:
             return f"I'm having trouble processing that. Could you rephrase your response?"
 
-    def get_next_intelligent_question(self, user_input: str) -> str:
+    def stream_gemini_with_intelligence(self, user_input: str) -> Iterator[str]:
+        """
+        Streaming version of call_gemini_with_intelligence, yielding text chunks as they arrive
+
+        Architecture Concept: Server-sent events let the first words print while the
+        rest of the response is still being generated.
+        """
+        payload = self._build_intelligent_payload(user_input)
+        received = False
+
+        try:
+            with self.session.post(self.stream_url, data=dumps(payload), stream=True, timeout=_REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+                    text = self._extract_text(loads(line[len(b"data: "):]))
+                    if text:
+                        received = True
+                        yield text
+
+        except requests.exceptions.RequestException:
+            yield f"I'm experiencing a connection issue. Let's continue - could you tell me more?"
+            return
+        except ValueError:
+            yield f"I'm having trouble processing that. Could you rephrase your response?"
+            return
+
+        if not received:
+            yield "I'm having trouble generating a response. Could you share more about what you're experiencing?"
+
+    def get_next_intelligent_question(self, user_input: str,
+                                      dynamic_question: Optional['DynamicQuestion'] = None) -> str:
         """
         Generate next question using dynamic questioning intelligence
 
         Architecture Concept: Adaptive Conversation Flow
+
+        Args:
+            dynamic_question: The dynamic questioner's pick for user_input, if it was
+                already generated (e.g. while waiting on the network)
         """
 
+        from dynamic_questioning import QuestionType  # already loaded by __init__
+
         # Generate dynamic question
-        dynamic_question = self.dynamic_questioner.generate_next_question(
-            self.discovery_session.user_responses,
-            self.conversation_stage,
-            user_input
-        )
+        if dynamic_question is None:
+            dynamic_question = self.generate_dynamic_question(user_input)
 
         # Check if we should suggest deep dive
-        strong_themes = [name for name, theme in self.context_manager.themes.items() if theme.strength >= 2.5]
+        has_strong_theme = self.context_manager.has_theme_with_strength(2.5)
 
-        if strong_themes and dynamic_question.question_type.value == "deep_dive":
+        if has_strong_theme and dynamic_question.question_type is QuestionType.DEEP_DIVE:
             return f"\n{dynamic_question.question_text}"
-        elif dynamic_question.question_type.value == "follow_up":
+        elif dynamic_question.question_type is QuestionType.FOLLOW_UP:
             return f"\n{dynamic_question.question_text}"
         elif self._should_continue_dynamic_flow():
             return f"\n{dynamic_question.question_text}"
@@ -149,32 +267,47 @@ Your response:"""
             # Fall back to standard progression if appropriate
             return ""
 
+    def generate_dynamic_question(self, user_input: str) -> 'DynamicQuestion':
+        """Ask the dynamic questioner for its next question - independent of the AI's reply"""
+        return self.dynamic_questioner.generate_next_question(
+            self.discovery_session.user_responses,
+            self.conversation_stage,
+            user_input
+        )
+
     def _should_continue_dynamic_flow(self) -> bool:
         """Determine if we should continue with dynamic flow or standard progression"""
 
         # Continue dynamic flow if we have strong patterns
-        strong_patterns = len([p for p in self.dynamic_questioner.response_patterns if p.confidence >= 0.8])
+        strong_patterns = self.dynamic_questioner.high_confidence_pattern_count()
 
         # Or if we haven't covered minimum areas
-        uncovered_areas = [area for area, covered in self.dynamic_questioner.coverage_status.items() if not covered]
+        uncovered_areas = sum(not covered for covered in self.dynamic_questioner.coverage_status.values())
 
-        return strong_patterns > 0 or len(uncovered_areas) > 2
+        return strong_patterns > 0 or uncovered_areas > 2
+
+    def _warm_connection(self):
+        """
+        Open the pooled HTTPS connection to Gemini ahead of the first turn
+
+        Architecture Concept: A keyless HEAD to the API host pays the DNS lookup and
+        TLS handshake up front without a billed request; the connection stays in the
+        session's keep-alive pool for the user's first message. It runs on the
+        single-worker executor, so it finishes before that worker streams a reply.
+        """
+        try:
+            self.session.head(_WARMUP_URL, timeout=_REQUEST_TIMEOUT)
+        except requests.exceptions.RequestException:
+            pass  # Warming is best-effort; the real call reports any errors
 
     def start_enhanced_discovery_journey(self):
         """
         Begin the enhanced discovery experience with all intelligence systems active
         """
-        print("=" * 80)
-        print("ENHANCED SPIRITUAL GIFTS DISCOVERY JOURNEY")
-        print("=" * 80)
-        print("Welcome to an intelligent, personalized spiritual gifts discovery experience!")
-        print("\nThis enhanced system will:")
-        print("  • Remember and reference your previous insights")
-        print("  • Adapt questions based on patterns in your responses")
-        print("  • Match my communication style to your preferences")
-        print("  • Provide a truly personalized discovery journey")
-        print("\nCommands: 'quit', 'save', 'progress', 'insights', 'style'")
-        print("-" * 80)
+        # Interactive sessions only: open the connection while the welcome is read
+        self._executor.submit(self._warm_connection)
+
+        print(_WELCOME_BANNER)
 
         # Start with first question
         first_question = self.discovery_session.get_next_question()
@@ -184,29 +317,15 @@ Your response:"""
         while True:
             user_input = input("\nYou: ").strip()
 
-            # Handle special commands
-            if user_input.lower() in ['quit', 'exit', 'bye']:
+            # Handle special commands - lowercased once, then a table lookup
+            command = user_input.lower()
+            if command in _EXIT_COMMANDS:
                 self._handle_enhanced_session_end()
                 break
 
-            elif user_input.lower() == 'save':
-                self._save_enhanced_session()
-                continue
-
-            elif user_input.lower() == 'progress':
-                self._show_enhanced_progress()
-                continue
-
-            elif user_input.lower() == 'insights':
-                self._show_current_insights()
-                continue
-
-            elif user_input.lower() == 'style':
-                self._show_personality_profile()
-                continue
-
-            elif user_input.lower() == 'help':
-                self._show_enhanced_help()
+            handler = self._commands.get(command)
+            if handler:
+                handler()
                 continue
 
             if not user_input:
@@ -216,16 +335,32 @@ Your response:"""
             self._process_user_input_with_intelligence(user_input)
 
             # Generate intelligent response
+            # The dynamic question doesn't depend on the AI's reply, so the request is
+            # started on a worker thread (running until the first chunk arrives) and the
+            # question is generated while the network round trip is in flight
+            stream = self.stream_gemini_with_intelligence(user_input)
+            first_chunk = self._executor.submit(next, stream, None)
+            dynamic_question = self.generate_dynamic_question(user_input)
+
+            # Stream the response so it starts printing before generation finishes
             print("\nGuide: ", end="", flush=True)
-            ai_response = self.call_gemini_with_intelligence(user_input)
-            print(ai_response)
+            chunks = []
+            chunk = first_chunk.result()
+            if chunk is not None:
+                print(chunk, end="", flush=True)
+                chunks.append(chunk)
+                for chunk in stream:
+                    print(chunk, end="", flush=True)
+                    chunks.append(chunk)
+            print()
+            ai_response = "".join(chunks)
 
             # Record the exchange
             self.context_manager.add_exchange(user_input, ai_response, self.conversation_stage)
             self.total_exchanges += 1
 
             # Get next question intelligently
-            next_question = self.get_next_intelligent_question(user_input)
+            next_question = self.get_next_intelligent_question(user_input, dynamic_question)
             if next_question:
                 print(next_question)
 
@@ -263,12 +398,14 @@ Your response:"""
 
         # Provide stage transition insight
         if self.conversation_stage != "completed":
-            print(f"\n--- Moving to {self.conversation_stage.replace('_', ' ').title()} Stage ---")
+            print(f"\n--- Moving to {self.discovery_session.stage_title(self.conversation_stage)} Stage ---")
 
-            # Provide intelligent transition based on context
-            strong_themes = [name for name, theme in self.context_manager.themes.items() if theme.strength >= 2.0]
-            if strong_themes:
-                print(f"I'm noticing strong themes around {', '.join(strong_themes[:2])} - let's explore this further.")
+            # Provide intelligent transition based on context - only the first two
+            # strong themes are named, so the search stops once it has them
+            if self.context_manager.has_theme_with_strength(2.0):
+                strong_themes = islice(
+                    (name for name, theme in self.context_manager.themes.items() if theme.strength >= 2.0), 2)
+                print(f"I'm noticing strong themes around {', '.join(strong_themes)} - let's explore this further.")
 
     def _handle_enhanced_session_end(self):
         """Handle session end with intelligence summary"""
@@ -288,21 +425,34 @@ Your response:"""
             print(f"  • Communication style: {personality_summary['primary_style']}")
 
         # Save session
-        session_filename = self.discovery_session.save_session()
-        context_filename = f"context_{self.discovery_session.session_id}.json"
-        self.context_manager.save_context(context_filename)
+        session_filename, context_filename = self._save_session_files(wait=True)
 
         print(f"\nSaved: {session_filename}, {context_filename}")
         print("Your journey of discovery continues!")
 
+    def _save_session_files(self, wait: bool = False) -> Tuple[str, str]:
+        """
+        Queue snapshots of the discovery session and the context for the background writer
+
+        Both files go out in one pass of the writer; with wait=True they are written
+        before this returns.
+        """
+        session_filename = self.discovery_session.session_filename()
+        context_filename = f"context_{self.discovery_session.session_id}.json"
+
+        ensure_directory(os.path.dirname(session_filename))
+        self._session_writer.submit(session_filename, self.discovery_session.snapshot())
+        self._session_writer.submit(context_filename, self.context_manager.snapshot())
+        if wait:
+            self._session_writer.flush()
+        return session_filename, context_filename
+
     def _save_enhanced_session(self):
         """Save all enhanced session data"""
 
-        session_filename = self.discovery_session.save_session()
-        context_filename = f"context_{self.discovery_session.session_id}.json"
-        self.context_manager.save_context(context_filename)
+        session_filename, context_filename = self._save_session_files()
 
-        print(f"\nEnhanced session saved:")
+        print(f"\nEnhanced session save queued:")
         print(f"  • Discovery data: {session_filename}")
         print(f"  • Context data: {context_filename}")
 
@@ -312,20 +462,19 @@ Your response:"""
         # Standard progress
         summary = self.discovery_session.get_session_summary()
         print(f"\n--- ENHANCED PROGRESS ---")
-        print(f"Current Stage: {summary['current_stage'].replace('_', ' ').title()}")
+        print(f"Current Stage: {self.discovery_session.stage_title(summary['current_stage'])}")
         print(f"Overall Progress: {summary['completion_percentage']:.1f}%")
         print(f"Total Exchanges: {self.total_exchanges}")
 
-        # Intelligence insights
-        context_summary = self.context_manager.get_conversation_summary()
-        print(f"High-Confidence Insights: {context_summary['high_confidence_insights']}")
+        # Intelligence insights - a running count, no need to build the full summary
+        print(f"High-Confidence Insights: {self.context_manager.high_confidence_insight_count()}")
 
         # Show top themes
-        if self.context_manager.themes:
-            top_themes = sorted(self.context_manager.themes.items(), key=lambda x: x[1].strength, reverse=True)[:3]
+        top_themes = self.context_manager.top_themes(3)
+        if top_themes:
             print(f"Emerging Themes:")
-            for theme_name, theme in top_themes:
-                print(f"  • {theme_name.title()}: {theme.strength:.1f} strength")
+            for theme in top_themes:
+                print(f"  • {theme.theme_name.title()}: {theme.strength:.1f} strength")
 
         print("--- END PROGRESS ---")
 
@@ -362,18 +511,7 @@ Your response:"""
 
     def _show_enhanced_help(self):
         """Show enhanced help information"""
-
-        print(f"\n--- ENHANCED HELP ---")
-        print("Commands:")
-        print("  'quit' - End session with intelligent summary")
-        print("  'save' - Save enhanced session data")
-        print("  'progress' - View progress with intelligence insights")
-        print("  'insights' - Show discovered insights")
-        print("  'style' - Show your communication style profile")
-        print("  'help' - Show this help")
-        print("\nThe enhanced system adapts to your communication style and")
-        print("remembers insights throughout our conversation.")
-        print("--- END HELP ---")
+        print(_HELP_TEXT)
 
 
 if __name__ == "__main__":
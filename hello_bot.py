@@ -5,13 +5,29 @@ Phase 1: Simple API integration with Google Gemini
 """
 
 import os
-import json
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+from json_storage import dumps, loads
+
 # Load environment variables
 load_dotenv()
 
+# Seconds to wait for a connection to Gemini, then for each read of its response
+_REQUEST_TIMEOUT = (5, 30)
+
+# Inputs that end the conversation
+_EXIT_COMMANDS = frozenset({'quit', 'exit', 'bye'})
+
+def _new_http_session():
+    """A pooled requests session for Gemini"""
+    session = requests.Session()
+    session.headers.update({"Content-Type": "application/json"})
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+    return session
+
 class HelloBot:
     def __init__(self):
         self.api_key = os.getenv('GOOGLE_API_KEY')
@@ -21,8 +37,15 @@ class HelloBot:
         # Gemini API endpoint
         self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={self.api_key}"
         
+        # One pooled HTTP session keeps the TLS connection to Gemini alive between turns
+        self.session = _new_http_session()
+        
     def call_gemini(self, prompt):
         """Make a request to Google Gemini API"""
+        return self._request_text(self.session, prompt)
+
+    def _request_text(self, session, prompt):
+        """Send one generateContent request on the given session"""
         
         payload = {
             "contents": [{
@@ -32,17 +55,11 @@ class HelloBot:
             }]
         }
         
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
         try:
-            response = requests.post(self.api_url, 
-                                   headers=headers, 
-                                   data=json.dumps(payload))
+            response = session.post(self.api_url, data=dumps(payload), timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            data = response.json()
+            data = loads(response.content)
             
             # Extract the generated text from the response
             if 'candidates' in data and len(data['candidates']) > 0:
@@ -55,9 +72,22 @@ class HelloBot:
             
         except requests.exceptions.RequestException as e:
             return f"Error calling API: {e}"
-        except KeyError as e:
+        except (KeyError, ValueError) as e:
             return f"Error parsing response: {e}"
     
+    def _request_text_on_own_session(self, prompt):
+        """_request_text on a short-lived session, for calls made from worker threads"""
+        with _new_http_session() as session:
+            return self._request_text(session, prompt)
+
+    async def acall_gemini(self, prompt):
+        """
+        Async version of call_gemini - runs the blocking request on a worker thread,
+        with its own session since requests.Session is not shared across threads
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._request_text_on_own_session, prompt)
+    
     def chat(self):
         """Simple chat loop"""
         print("Hello! I'm your spiritual discovery guide.")
@@ -66,8 +96,9 @@ class HelloBot:
         
         while True:
             user_input = input("You: ").strip()
+            command = user_input.lower()
             
-            if user_input.lower() in ['quit', 'exit', 'bye']:
+            if command in _EXIT_COMMANDS:
                 print("Bot: Thank you for chatting! May your journey of self-discovery continue to flourish.")
                 break
             
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+JSON Storage Helpers
+Shared serialization for sessions, assessments and context snapshots
+
+Key Architecture Concepts:
+1. One Code Path: Every save/load goes through the same helpers
+2. Optional Speedup: orjson is used when installed, the standard json module otherwise
+3. Serialize Objects Directly: Dataclasses and deques are encoded as they are,
+   so callers don't have to build a parallel dict tree before writing
+4. Atomic Writes: Files are written to a temporary name and swapped into place,
+   so an interrupted save never leaves half-written JSON behind
+5. Debounced Saves: DebouncedWriter moves writes off the caller's thread and
+   collapses a burst of saves to the same file into one write; shared_writer()
+   hands every caller the same instance, so a process runs at most one writer thread
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from datetime import datetime
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the standard library
+    orjson = None
+
+# Like the json module, orjson should write non-string dict keys (e.g. ints) as strings
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _default(obj: Any) -> Any:
+    """Encode the container types our data models use"""
+    if isinstance(obj, (deque, set, frozenset, tuple)):
+        return list(obj)
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document from a string or bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize data to compact UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def timestamp_to_iso(timestamp: Any) -> Any:
+    """Convert an epoch-nanosecond timestamp (time.time_ns()) to ISO format (strings pass through)"""
+    if isinstance(timestamp, int):
+        return datetime.fromtimestamp(timestamp / 1e9).isoformat()
+    return timestamp
+
+
+@lru_cache(maxsize=None)
+def ensure_directory(path: str):
+    """Create a directory (and parents) the first time it is needed in this process"""
+    if path:
+        os.makedirs(path, exist_ok=True)
+
+
+def dumps_indented(data: Any) -> str:
+    """Serialize data to indented JSON text, e.g. for logs and summaries"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_default)
+
+
+def save_json(filename: str, data: Any):
+    """
+    Atomically write data to filename as indented UTF-8 JSON
+
+    Architecture Concept: The document is serialized into one bytes buffer and written
+    with a single call - json.dump would push it through the text layer in many small
+    writes, re-encoding each piece.
+    """
+    if orjson is not None:
+        buffer = orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2)
+    else:
+        buffer = json.dumps(data, indent=2, ensure_ascii=False, default=_default).encode('utf-8')
+
+    # Unique per thread so a background save never shares a temp file with the main thread
+    temp_filename = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_filename, 'wb') as f:
+            f.write(buffer)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
+def load_json(filename: str) -> Any:
+    """Read JSON data from filename"""
+    if orjson is not None:
+        with open(filename, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class DebouncedWriter:
+    """
+    Background JSON writer that coalesces rapid successive saves
+
+    Architecture Concept: submit() only records the latest data for a file and
+    returns immediately. A daemon thread waits out the debounce delay, then writes
+    each pending file once - so saving ten times in a second costs one write.
+    Callers must pass a snapshot, since the data is serialized later on another thread.
+    The thread is started by the first submit(), not on construction.
+    """
+
+    def __init__(self, delay: float = 0.5):
+        self.delay = delay
+        self._pending: Dict[str, Any] = {}
+        self._writing = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def submit(self, filename: str, data: Any):
+        """Queue data to be written to filename, replacing any older pending data"""
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+                # Daemon threads are killed at exit - make sure queued saves still land
+                atexit.register(self.flush)
+
+            self._pending[filename] = data
+            self._condition.notify_all()
+
+    def flush(self):
+        """Write everything pending now, on the calling thread"""
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+            pending, self._pending = self._pending, {}
+            self._writing = True
+
+        try:
+            for filename, data in pending.items():
+                try:
+                    save_json(filename, data)
+                except (OSError, TypeError, ValueError) as e:
+                    print(f"Error saving {filename}: {e}")
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+            time.sleep(self.delay)
+            self.flush()
+
+
+@lru_cache(maxsize=None)
+def shared_writer() -> DebouncedWriter:
+    """The process-wide DebouncedWriter, created on first use"""
+    return DebouncedWriter()
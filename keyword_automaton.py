@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Keyword Automaton
+Aho-Corasick multi-keyword matcher shared by the analysis engines
+
+Key Architecture Concepts:
+1. Build Once: All keywords are compiled into a single trie with failure links
+2. Single Pass: A response is scanned once no matter how many keywords exist
+3. Tagged Matches: Each keyword carries payloads (e.g. which category it belongs to)
+4. Resolved Transitions: Failure links are folded into a per-state transition table,
+   so scanning costs exactly one dict lookup per character
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton for finding many keywords in one sweep
+
+    Matching uses plain substring semantics, so results are the same as
+    checking `keyword in text` for every keyword - just without rescanning
+    the text once per keyword.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, Any]]] = [[]]
+        self._delta: List[Dict[str, int]] = [{}]
+        self._built = False
+
+    def add_keyword(self, keyword: str, payload: Any = None):
+        """Add a keyword with an associated payload (a keyword may be added several times)"""
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+
+        self._output[node].append((keyword, payload))
+        self._built = False
+
+    def build(self):
+        """Compute failure links so the automaton can be scanned in one pass"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                # Follow failure links until we find a state that can consume char
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+
+                # Inherit matches that end at the fallback state
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        self._build_delta()
+        self._built = True
+
+    def _build_delta(self):
+        """
+        Resolve failure links into a complete transition table
+
+        Architecture Concept: delta[state] maps every character that leads somewhere
+        other than the root to the state reached, failure chain included. The scan
+        loop then needs no inner while-loop - unknown characters simply go to root.
+        States are visited in breadth-first order, so a state's failure target is
+        always resolved before the state itself.
+        """
+        goto = self._goto
+        fail = self._fail
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            transitions = dict(delta[fail[node]])
+            transitions.update(goto[node])
+            delta[node] = transitions
+            queue.extend(goto[node].values())
+
+        self._delta = delta
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str, Any]]:
+        """Yield (end_index, keyword, payload) for every keyword occurrence in text"""
+        if not self._built:
+            self.build()
+
+        delta = self._delta
+        output = self._output
+        node = 0
+
+        for index, char in enumerate(text):
+            node = delta[node].get(char, 0)
+
+            for keyword, payload in output[node]:
+                yield index, keyword, payload
+
+    def distinct_matches(self, text: str) -> Set[Tuple[str, Any]]:
+        """
+        Return the set of (keyword, payload) pairs found anywhere in text
+
+        Architecture Concept: The scan loop only records which states were reached;
+        match tuples are collected once per distinct state afterwards instead of
+        being yielded for every occurrence. Payloads must be hashable.
+        """
+        return self.resume_matches(text)[0]
+
+    def resume_matches(self, text: str, state: int = 0) -> Tuple[Set[Tuple[str, Any]], int]:
+        """
+        Scan text starting from a previous scan's end state
+
+        Returns (distinct matches, end state). Feeding a text in pieces, each starting
+        from the state the previous piece ended in, finds exactly the matches of the
+        whole text - including keywords that span two pieces.
+        """
+        reached, node = self.resume_states(text, state)
+        output = self._output
+        return {hit for state in reached for hit in output[state]}, node
+
+    def resume_states(self, text: str, state: int = 0) -> Tuple[Set[int], int]:
+        """
+        Like resume_matches, but return the matching states reached instead of matches
+
+        Architecture Concept: Callers that fold each state's matches into their own
+        precomputed result (see match_states) skip building match tuples entirely.
+        """
+        if not self._built:
+            self.build()
+
+        delta = self._delta
+        output = self._output
+        reached = set()
+        node = state
+
+        for char in text:
+            node = delta[node].get(char, 0)
+            if output[node]:
+                reached.add(node)
+
+        return reached, node
+
+    def match_states(self) -> Iterator[Tuple[int, List[Tuple[str, Any]]]]:
+        """Yield (state, matches) for every state at which some keyword ends"""
+        if not self._built:
+            self.build()
+
+        for state, matches in enumerate(self._output):
+            if matches:
+                yield state, matches
@@ -5,62 +5,67 @@ Adds memory and multi-turn conversation capabilities
 """
 
 import os
-import json
+import time
 import requests
+from collections import deque
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from dotenv import load_dotenv
 
+from json_storage import dumps, loads, save_json, ensure_directory, timestamp_to_iso
+
 # Load environment variables
 load_dotenv()
 
+# Seconds to wait for a connection to Gemini, then for each read of its response
+_REQUEST_TIMEOUT = (5, 30)
+
+# Inputs that end the conversation
+_EXIT_COMMANDS = frozenset({'quit', 'exit', 'bye'})
+
 class ConversationMemory:
     """Manages conversation history and context"""
     
     def __init__(self):
-        self.messages = []
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.max_history = 10  # Keep last 10 exchanges to manage token limits
         
+        # Only recent messages are kept to avoid token limits (2 messages per exchange);
+        # the bounded deque drops the oldest one in O(1) as each new one arrives
+        self.messages = deque(maxlen=self.max_history * 2)
+        
+        # The same messages already formatted as prompt lines, evicted in step
+        self._formatted = deque(maxlen=self.max_history * 2)
+        
     def add_message(self, role, content):
         """Add a message to conversation history"""
         self.messages.append({
             "role": role,  # "user" or "bot"
             "content": content,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": time.time_ns()  # Epoch nanoseconds - converted to ISO when saved
         })
-        
-        # Keep only recent messages to avoid token limits
-        if len(self.messages) > self.max_history * 2:  # 2 messages per exchange
-            self.messages = self.messages[-self.max_history * 2:]
+        self._formatted.append(f"{'User' if role == 'user' else 'Bot'}: {content}")
     
     def get_context(self):
         """Build conversation context for API call"""
-        context = ""
-        for msg in self.messages:
-            if msg["role"] == "user":
-                context += f"User: {msg['content']}\n"
-            else:
-                context += f"Bot: {msg['content']}\n"
-        return context.strip()
+        return "\n".join(self._formatted).strip()
     
     def save_session(self, filename=None):
         """Save conversation to JSON file"""
         if not filename:
             filename = f"sessions/session_{self.session_id}.json"
         
-        # Create sessions directory if it doesn't exist
-        os.makedirs("sessions", exist_ok=True)
+        ensure_directory("sessions")
         
         session_data = {
             "session_id": self.session_id,
-            "created": self.messages[0]["timestamp"] if self.messages else datetime.now().isoformat(),
+            "created": timestamp_to_iso(self.messages[0]["timestamp"]) if self.messages else datetime.now().isoformat(),
             "last_updated": datetime.now().isoformat(),
             "message_count": len(self.messages),
-            "messages": self.messages
+            "messages": [dict(msg, timestamp=timestamp_to_iso(msg["timestamp"])) for msg in self.messages]
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
+        save_json(filename, session_data)
         
         return filename
 
@@ -73,6 +78,12 @@ class MemoryBot:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
         
         self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={self.api_key}"
+        
+        # One pooled HTTP session keeps the TLS connection to Gemini alive between turns
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        
         self.memory = ConversationMemory()
         
         # System prompt for spiritual discovery
@@ -81,6 +92,10 @@ class MemoryBot:
         Ask thoughtful follow-up questions based on what the person has already shared.
         Help them explore the connection between their skills (what they're good at) and their passions (what they enjoy).
         Keep responses warm, insightful, and concise."""
+        
+        # The persona never changes, so it is sent as a separate system instruction
+        # built once here - a stable prefix the API can reuse across turns
+        self._system_instruction = {"parts": [{"text": self.system_prompt}]}
     
     def call_gemini(self, user_input):
         """Make API call with conversation context"""
@@ -88,29 +103,25 @@ class MemoryBot:
         # Build full prompt with conversation history
         context = self.memory.get_context()
         if context:
-            full_prompt = f"{self.system_prompt}\n\nPrevious conversation:\n{context}\n\nUser: {user_input}\n\nBot:"
+            full_prompt = f"Previous conversation:\n{context}\n\nUser: {user_input}\n\nBot:"
         else:
-            full_prompt = f"{self.system_prompt}\n\nUser: {user_input}\n\nBot:"
+            full_prompt = f"User: {user_input}\n\nBot:"
         
         payload = {
+            "systemInstruction": self._system_instruction,
             "contents": [{
+                "role": "user",
                 "parts": [{
                     "text": full_prompt
                 }]
             }]
         }
         
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
         try:
-            response = requests.post(self.api_url, 
-                                   headers=headers, 
-                                   data=json.dumps(payload))
+            response = self.session.post(self.api_url, data=dumps(payload), timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            data = response.json()
+            data = loads(response.content)
             
             if 'candidates' in data and len(data['candidates']) > 0:
                 if 'content' in data['candidates'][0]:
@@ -122,7 +133,7 @@ class MemoryBot:
             
         except requests.exceptions.RequestException as e:
             return f"Error calling API: {e}"
-        except KeyError as e:
+        except (KeyError, ValueError) as e:
             return f"Error parsing response: {e}"
     
     def chat(self):
@@ -137,25 +148,28 @@ class MemoryBot:
         
         while True:
             user_input = input("\nYou: ").strip()
+            command = user_input.lower()
             
-            if user_input.lower() in ['quit', 'exit', 'bye']:
+            if command in _EXIT_COMMANDS:
                 # Save session on exit
                 filename = self.memory.save_session()
                 print(f"\nBot: Thank you for our meaningful conversation! Your session has been saved to {filename}")
                 print("May your journey of self-discovery continue to flourish. 🙏")
                 break
             
-            if user_input.lower() == 'save':
+            if command == 'save':
                 filename = self.memory.save_session()
                 print(f"\nSession saved to {filename}")
                 continue
                 
-            if user_input.lower() == 'history':
-                print("\n--- Conversation History ---")
+            if command == 'history':
+                # Built as one string so the history goes out in a single print
+                lines = ["\n--- Conversation History ---"]
                 for msg in self.memory.messages:
                     role_icon = "👤" if msg["role"] == "user" else "🤖"
-                    print(f"{role_icon} {msg['role'].title()}: {msg['content']}")
-                print("--- End History ---")
+                    lines.append(f"{role_icon} {msg['role'].title()}: {msg['content']}")
+                lines.append("--- End History ---")
+                print("\n".join(lines))
                 continue
             
             if not user_input:
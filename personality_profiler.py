@@ -11,7 +11,10 @@ Key Architecture Concepts:
 """
 
 import json
-from typing import Dict, List, Optional, Tuple
+import string
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -29,6 +32,9 @@ class ResponseDepth(Enum):
 @dataclass
 class PersonalityMarkers:
     """Indicators of user personality from communication patterns"""
+    __slots__ = ('word_count_avg', 'emotional_language_frequency', 'question_asking_frequency',
+                 'concrete_vs_abstract_ratio', 'uncertainty_indicators', 'enthusiasm_markers')
+
     word_count_avg: float
     emotional_language_frequency: float
     question_asking_frequency: float
@@ -39,6 +45,8 @@ class PersonalityMarkers:
 @dataclass
 class CommunicationProfile:
     """User's communication style profile"""
+    __slots__ = ('primary_style', 'secondary_style', 'preferred_depth', 'confidence', 'markers', 'adaptations')
+
     primary_style: CommunicationStyle
     secondary_style: Optional[CommunicationStyle]
     preferred_depth: ResponseDepth
@@ -46,6 +54,145 @@ class CommunicationProfile:
     markers: PersonalityMarkers
     adaptations: List[str]  # Specific adaptations to make
 
+# Styles in the order determine_communication_style scores them
+_SCORED_STYLES = (CommunicationStyle.ANALYTICAL, CommunicationStyle.EXPRESSIVE,
+                  CommunicationStyle.PRACTICAL, CommunicationStyle.REFLECTIVE)
+
+# Primary style guidance
+_STYLE_INSTRUCTIONS: Dict[CommunicationStyle, str] = {
+    CommunicationStyle.ANALYTICAL: "Be logical, structured, and precise. Use specific examples. Ask clarifying questions.",
+    CommunicationStyle.EXPRESSIVE: "Be warm, enthusiastic, and emotionally engaging. Use vivid language that matches their energy.",
+    CommunicationStyle.PRACTICAL: "Be concise, direct, and action-oriented. Focus on practical insights and next steps.",
+    CommunicationStyle.REFLECTIVE: "Be thoughtful, patient, and introspective. Allow space for contemplation and deeper reflection."
+}
+
+# Depth guidance
+_DEPTH_INSTRUCTIONS: Dict[ResponseDepth, str] = {
+    ResponseDepth.BRIEF: "Keep responses concise (2-3 sentences typically).",
+    ResponseDepth.MODERATE: "Provide balanced detail (1-2 paragraphs typically).",
+    ResponseDepth.DETAILED: "Offer comprehensive responses with thorough explanation."
+}
+
+# Standing adaptations for each style, before depth and marker extras
+_STYLE_ADAPTATIONS: Dict[CommunicationStyle, Tuple[str, ...]] = {
+    CommunicationStyle.ANALYTICAL: (
+        "Use structured, logical responses",
+        "Include specific examples and data points",
+        "Avoid overly emotional language",
+        "Ask clarifying questions for precision"
+    ),
+    CommunicationStyle.EXPRESSIVE: (
+        "Use warm, encouraging language",
+        "Include emotional validation",
+        "Use vivid, descriptive language",
+        "Match their enthusiasm level"
+    ),
+    CommunicationStyle.PRACTICAL: (
+        "Keep responses concise and actionable",
+        "Focus on concrete next steps",
+        "Avoid excessive elaboration",
+        "Be direct and clear"
+    ),
+    CommunicationStyle.REFLECTIVE: (
+        "Allow processing time between questions",
+        "Use thoughtful, introspective language",
+        "Validate their careful consideration",
+        "Ask open-ended, reflective questions"
+    )
+}
+
+# Depth adaptations (moderate depth needs none)
+_DEPTH_ADAPTATIONS: Dict[ResponseDepth, str] = {
+    ResponseDepth.BRIEF: "Keep responses shorter and more focused",
+    ResponseDepth.DETAILED: "Provide comprehensive, thorough responses"
+}
+
+@lru_cache(maxsize=64)
+def _style_guidance(style: CommunicationStyle, depth: ResponseDepth, adaptations: Tuple[str, ...]) -> str:
+    """Assemble the LLM style guidance for one combination of profile traits"""
+    guidance_parts = [
+        f"COMMUNICATION STYLE: {_STYLE_INSTRUCTIONS[style]}",
+        f"RESPONSE DEPTH: {_DEPTH_INSTRUCTIONS[depth]}"
+    ]
+
+    # Specific adaptations
+    if adaptations:
+        guidance_parts.append(f"SPECIFIC ADAPTATIONS: {' | '.join(adaptations)}")
+
+    return " ".join(guidance_parts)
+
+_PUNCTUATION = string.punctuation
+
+# Marker vocabularies. Single words are matched against the response's words, so
+# 'love' no longer matches inside 'lovely'; phrases are still found as substrings.
+_EMOTIONAL_WORDS = frozenset({
+    'love', 'passionate', 'excited', 'energized', 'alive', 'frustrated', 'concerned',
+    'worried', 'joyful', 'thrilled', 'overwhelmed', 'blessed', 'grateful', 'moved'
+})
+_CONCRETE_WORDS = frozenset({
+    'specific', 'example', 'exactly', 'precisely', 'literally', 'actually',
+    'definitely', 'clearly', 'obviously', 'specifically'
+})
+_ABSTRACT_WORDS = frozenset({
+    'generally', 'usually', 'often', 'sometimes', 'might', 'could',
+    'possibly', 'perhaps', 'maybe'
+})
+_ABSTRACT_PHRASES = ('tend to', 'feel like')
+_UNCERTAINTY_WORDS = frozenset({'maybe', 'perhaps'})
+_UNCERTAINTY_PHRASES = ('not sure', 'i think', 'might be', 'could be', 'i guess')
+_ENTHUSIASM_WORDS = frozenset({'really', 'absolutely', 'definitely', 'totally', 'amazing', 'wonderful', 'incredible'})
+_ENTHUSIASM_PHRASES = ('!',)  # Not a word - found as a substring, on top of the per-mark count
+
+# Number of raw counts _add_response_counts accumulates
+_COUNT_FIELDS = 7
+
+def _build_marker_vocabulary() -> Tuple[Dict[str, Tuple[int, ...]], Tuple[Tuple[str, Tuple[int, ...]], ...]]:
+    """
+    Merge the vocabularies into a word -> count indexes map and a phrase table
+
+    Architecture Concept: A term listed in several vocabularies (e.g. 'maybe') is
+    looked up once and credited to each of them. Words cost one dict lookup per
+    word of the response; only the few multi-word phrases need a substring search.
+    """
+    word_fields: Dict[str, List[int]] = {}
+    for field, vocabulary in ((1, _EMOTIONAL_WORDS), (3, _CONCRETE_WORDS), (4, _ABSTRACT_WORDS),
+                              (5, _UNCERTAINTY_WORDS), (6, _ENTHUSIASM_WORDS)):
+        for word in vocabulary:
+            word_fields.setdefault(word, []).append(field)
+
+    phrases = tuple((phrase, (field,))
+                    for field, vocabulary in ((4, _ABSTRACT_PHRASES), (5, _UNCERTAINTY_PHRASES), (6, _ENTHUSIASM_PHRASES))
+                    for phrase in vocabulary)
+    return {word: tuple(fields) for word, fields in word_fields.items()}, phrases
+
+_MARKER_WORDS, _MARKER_PHRASES = _build_marker_vocabulary()
+
+def _add_response_counts(totals: List[int], response: str):
+    """
+    Add one response's raw marker counts to totals, from a single lowercase copy
+
+    totals holds (words, emotional, questions, concrete, abstract, uncertainty, enthusiasm).
+    Counts add up across responses, so markers for many responses are built from sums.
+    """
+    response_lower = response.lower()
+    words = response_lower.split()
+    totals[0] += len(words)
+    totals[2] += response.count('?')
+    totals[6] += response.count('!')
+
+    # Each vocabulary word counts every time it is used
+    for word in words:
+        fields = _MARKER_WORDS.get(word.strip(_PUNCTUATION))
+        if fields:
+            for field in fields:
+                totals[field] += 1
+
+    # A phrase counts once, however often it appears
+    for phrase, fields in _MARKER_PHRASES:
+        if phrase in response_lower:
+            for field in fields:
+                totals[field] += 1
+
 class PersonalityProfiler:
     """
     Analyzes user communication patterns and provides style adaptation guidance
@@ -58,7 +205,10 @@ class PersonalityProfiler:
     """
 
     def __init__(self):
-        self.communication_samples: List[str] = []
+        # Only the most recent responses are kept - markers come from the running
+        # totals below, so older text can be dropped without changing the profile
+        self.sample_window = 50
+        self.communication_samples: Deque[str] = deque(maxlen=self.sample_window)
         self.current_profile: Optional[CommunicationProfile] = None
         self.style_history: List[CommunicationStyle] = []
 
@@ -66,6 +216,11 @@ class PersonalityProfiler:
         self.min_samples_for_profile = 3
         self.confidence_threshold = 0.6
 
+        # Architecture Concept: Marker counts are summed as samples arrive, so updating
+        # the profile analyzes only the new response instead of the whole history
+        self._sample_totals = [0] * _COUNT_FIELDS
+        self._sample_count = 0
+
     def analyze_communication_patterns(self, user_responses: List[str]) -> PersonalityMarkers:
         """
         Analyze user communication patterns to identify personality markers
@@ -75,64 +230,33 @@ class PersonalityProfiler:
         if not user_responses:
             return self._default_markers()
 
-        # Calculate communication metrics
-        total_words = sum(len(response.split()) for response in user_responses)
-        avg_word_count = total_words / len(user_responses) if user_responses else 0
+        totals = [0] * _COUNT_FIELDS
+        for response in user_responses:
+            _add_response_counts(totals, response)
 
-        # Emotional language analysis
-        emotional_words = [
-            'love', 'passionate', 'excited', 'energized', 'alive', 'frustrated', 'concerned',
-            'worried', 'joyful', 'thrilled', 'overwhelmed', 'blessed', 'grateful', 'moved'
-        ]
+        return self._markers_from_counts(totals, len(user_responses))
 
-        emotional_count = 0
-        for response in user_responses:
-            response_lower = response.lower()
-            emotional_count += sum(1 for word in emotional_words if word in response_lower)
+    def _markers_from_counts(self, totals: List[int], response_count: int) -> PersonalityMarkers:
+        """Turn summed raw counts for response_count responses into personality markers"""
+        total_words, emotional_count, question_count, concrete_count, abstract_count, \
+            uncertainty_count, enthusiasm_count = totals
+
+        # Calculate communication metrics
+        avg_word_count = total_words / response_count
 
+        # Emotional language analysis
         emotional_frequency = emotional_count / total_words if total_words > 0 else 0
 
         # Question asking frequency
-        question_count = sum(response.count('?') for response in user_responses)
-        question_frequency = question_count / len(user_responses) if user_responses else 0
+        question_frequency = question_count / response_count
 
         # Concrete vs abstract language
-        concrete_words = [
-            'specific', 'example', 'exactly', 'precisely', 'literally', 'actually',
-            'definitely', 'clearly', 'obviously', 'specifically'
-        ]
-        abstract_words = [
-            'generally', 'usually', 'often', 'sometimes', 'might', 'could',
-            'possibly', 'perhaps', 'maybe', 'tend to', 'feel like'
-        ]
-
-        concrete_count = sum(
-            sum(1 for word in concrete_words if word in response.lower())
-            for response in user_responses
-        )
-        abstract_count = sum(
-            sum(1 for word in abstract_words if word in response.lower())
-            for response in user_responses
-        )
-
         concrete_ratio = concrete_count / (concrete_count + abstract_count) if (concrete_count + abstract_count) > 0 else 0.5
 
         # Uncertainty indicators
-        uncertainty_words = ['not sure', 'i think', 'maybe', 'perhaps', 'might be', 'could be', 'i guess']
-        uncertainty_count = sum(
-            sum(1 for phrase in uncertainty_words if phrase in response.lower())
-            for response in user_responses
-        )
-        uncertainty_frequency = uncertainty_count / len(user_responses) if user_responses else 0
+        uncertainty_frequency = uncertainty_count / response_count
 
         # Enthusiasm markers
-        enthusiasm_words = ['!', 'really', 'absolutely', 'definitely', 'totally', 'amazing', 'wonderful', 'incredible']
-        enthusiasm_count = 0
-        for response in user_responses:
-            response_lower = response.lower()
-            enthusiasm_count += sum(1 for word in enthusiasm_words if word in response_lower)
-            enthusiasm_count += response.count('!')
-
         enthusiasm_frequency = enthusiasm_count / total_words if total_words > 0 else 0
 
         return PersonalityMarkers(
@@ -162,67 +286,66 @@ class PersonalityProfiler:
         Architecture Concept: Pattern Classification
         """
 
-        style_scores = {}
+        # Each marker is read once - the rules below test most of them several times
+        word_count = markers.word_count_avg
+        emotional = markers.emotional_language_frequency
+        questions = markers.question_asking_frequency
+        concrete_ratio = markers.concrete_vs_abstract_ratio
+        uncertainty = markers.uncertainty_indicators
+        enthusiasm = markers.enthusiasm_markers
 
         # Analytical style indicators
         analytical_score = 0
-        if markers.concrete_vs_abstract_ratio > 0.6:
+        if concrete_ratio > 0.6:
             analytical_score += 0.3
-        if markers.word_count_avg > 25:
+        if word_count > 25:
             analytical_score += 0.2
-        if markers.emotional_language_frequency < 0.03:
+        if emotional < 0.03:
             analytical_score += 0.2
-        if markers.question_asking_frequency > 0.3:
+        if questions > 0.3:
             analytical_score += 0.2
-        if markers.uncertainty_indicators < 0.1:
+        if uncertainty < 0.1:
             analytical_score += 0.1
 
-        style_scores[CommunicationStyle.ANALYTICAL] = analytical_score
-
         # Expressive style indicators
         expressive_score = 0
-        if markers.emotional_language_frequency > 0.01:  # Lower threshold
+        if emotional > 0.01:  # Lower threshold
             expressive_score += 0.3
-        if markers.enthusiasm_markers > 0.02:  # Lower threshold
+        if enthusiasm > 0.02:  # Lower threshold
             expressive_score += 0.3
-        if markers.word_count_avg > 20:
+        if word_count > 20:
             expressive_score += 0.2
-        if markers.concrete_vs_abstract_ratio < 0.4:
+        if concrete_ratio < 0.4:
             expressive_score += 0.2
 
-        style_scores[CommunicationStyle.EXPRESSIVE] = expressive_score
-
         # Practical style indicators
         practical_score = 0
-        if markers.word_count_avg < 15:
+        if word_count < 15:
             practical_score += 0.3
-        if markers.concrete_vs_abstract_ratio > 0.7:
+        if concrete_ratio > 0.7:
             practical_score += 0.3
-        if markers.emotional_language_frequency < 0.04:
+        if emotional < 0.04:
             practical_score += 0.2
-        if markers.question_asking_frequency < 0.2:
+        if questions < 0.2:
             practical_score += 0.2
 
-        style_scores[CommunicationStyle.PRACTICAL] = practical_score
-
         # Reflective style indicators
         reflective_score = 0
-        if markers.uncertainty_indicators > 0.15:
+        if uncertainty > 0.15:
             reflective_score += 0.3
-        if markers.word_count_avg > 30:
+        if word_count > 30:
             reflective_score += 0.2
-        if markers.question_asking_frequency > 0.25:
+        if questions > 0.25:
             reflective_score += 0.2
-        if markers.concrete_vs_abstract_ratio < 0.5:
+        if concrete_ratio < 0.5:
             reflective_score += 0.2
-        if markers.emotional_language_frequency > 0.03 and markers.emotional_language_frequency < 0.08:
+        if emotional > 0.03 and emotional < 0.08:
             reflective_score += 0.1
 
-        style_scores[CommunicationStyle.REFLECTIVE] = reflective_score
-
-        # Find primary style
-        primary_style = max(style_scores.items(), key=lambda x: x[1])
-        return primary_style[0], primary_style[1]
+        # Find primary style (ties go to the style listed first)
+        scores = (analytical_score, expressive_score, practical_score, reflective_score)
+        best_score = max(scores)
+        return _SCORED_STYLES[scores.index(best_score)], best_score
 
     def determine_response_depth(self, markers: PersonalityMarkers) -> ResponseDepth:
         """Determine preferred response depth"""
@@ -244,7 +367,10 @@ class PersonalityProfiler:
             return None
 
         # Analyze patterns
-        markers = self.analyze_communication_patterns(user_responses)
+        return self._profile_from_markers(self.analyze_communication_patterns(user_responses))
+
+    def _profile_from_markers(self, markers: PersonalityMarkers) -> CommunicationProfile:
+        """Classify markers into a profile and make it the current one"""
 
         # Determine primary style
         primary_style, confidence = self.determine_communication_style(markers)
@@ -273,43 +399,11 @@ class PersonalityProfiler:
     def _generate_adaptations(self, style: CommunicationStyle, depth: ResponseDepth, markers: PersonalityMarkers) -> List[str]:
         """Generate specific adaptations based on style"""
 
-        adaptations = []
-
-        # Style-based adaptations
-        if style == CommunicationStyle.ANALYTICAL:
-            adaptations.extend([
-                "Use structured, logical responses",
-                "Include specific examples and data points",
-                "Avoid overly emotional language",
-                "Ask clarifying questions for precision"
-            ])
-        elif style == CommunicationStyle.EXPRESSIVE:
-            adaptations.extend([
-                "Use warm, encouraging language",
-                "Include emotional validation",
-                "Use vivid, descriptive language",
-                "Match their enthusiasm level"
-            ])
-        elif style == CommunicationStyle.PRACTICAL:
-            adaptations.extend([
-                "Keep responses concise and actionable",
-                "Focus on concrete next steps",
-                "Avoid excessive elaboration",
-                "Be direct and clear"
-            ])
-        elif style == CommunicationStyle.REFLECTIVE:
-            adaptations.extend([
-                "Allow processing time between questions",
-                "Use thoughtful, introspective language",
-                "Validate their careful consideration",
-                "Ask open-ended, reflective questions"
-            ])
-
-        # Depth-based adaptations
-        if depth == ResponseDepth.BRIEF:
-            adaptations.append("Keep responses shorter and more focused")
-        elif depth == ResponseDepth.DETAILED:
-            adaptations.append("Provide comprehensive, thorough responses")
+        # Style- and depth-based adaptations
+        adaptations = list(_STYLE_ADAPTATIONS[style])
+        depth_adaptation = _DEPTH_ADAPTATIONS.get(depth)
+        if depth_adaptation:
+            adaptations.append(depth_adaptation)
 
         # Marker-based adaptations
         if markers.uncertainty_indicators > 0.2:
@@ -329,46 +423,25 @@ class PersonalityProfiler:
         if not self.current_profile:
             return "Respond naturally with warmth and insight."
 
+        # The text depends only on these three parts of the profile, so a profile
+        # rebuilt without a change to them reuses the guidance already assembled
         profile = self.current_profile
-        guidance_parts = []
-
-        # Primary style guidance
-        style_instructions = {
-            CommunicationStyle.ANALYTICAL: "Be logical, structured, and precise. Use specific examples. Ask clarifying questions.",
-            CommunicationStyle.EXPRESSIVE: "Be warm, enthusiastic, and emotionally engaging. Use vivid language that matches their energy.",
-            CommunicationStyle.PRACTICAL: "Be concise, direct, and action-oriented. Focus on practical insights and next steps.",
-            CommunicationStyle.REFLECTIVE: "Be thoughtful, patient, and introspective. Allow space for contemplation and deeper reflection."
-        }
-
-        guidance_parts.append(f"COMMUNICATION STYLE: {style_instructions[profile.primary_style]}")
-
-        # Depth guidance
-        depth_instructions = {
-            ResponseDepth.BRIEF: "Keep responses concise (2-3 sentences typically).",
-            ResponseDepth.MODERATE: "Provide balanced detail (1-2 paragraphs typically).",
-            ResponseDepth.DETAILED: "Offer comprehensive responses with thorough explanation."
-        }
-
-        guidance_parts.append(f"RESPONSE DEPTH: {depth_instructions[profile.preferred_depth]}")
-
-        # Specific adaptations
-        if profile.adaptations:
-            guidance_parts.append(f"SPECIFIC ADAPTATIONS: {' | '.join(profile.adaptations[:3])}")
-
-        return " ".join(guidance_parts)
+        return _style_guidance(profile.primary_style, profile.preferred_depth, tuple(profile.adaptations[:3]))
 
     def update_profile(self, new_response: str):
         """Update profile with new response data"""
         self.communication_samples.append(new_response)
+        _add_response_counts(self._sample_totals, new_response)
+        self._sample_count += 1
 
         # Rebuild profile if we have enough samples
-        if len(self.communication_samples) >= self.min_samples_for_profile:
-            self.build_communication_profile(self.communication_samples)
+        if self._sample_count >= self.min_samples_for_profile:
+            self._profile_from_markers(self._markers_from_counts(self._sample_totals, self._sample_count))
 
     def get_profile_summary(self) -> Dict:
         """Get summary of current profile for analysis"""
         if not self.current_profile:
-            return {"status": "insufficient_data", "samples_needed": self.min_samples_for_profile - len(self.communication_samples)}
+            return {"status": "insufficient_data", "samples_needed": self.min_samples_for_profile - self._sample_count}
 
         profile = self.current_profile
         return {
@@ -382,7 +455,7 @@ class PersonalityProfiler:
                 "uncertainty_level": profile.markers.uncertainty_indicators
             },
             "adaptations_count": len(profile.adaptations),
-            "total_samples": len(self.communication_samples)
+            "total_samples": self._sample_count
         }
 
 
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+Reuses earlier Gemini responses for identical or reworded prompts
+
+Key Architecture Concepts:
+1. Exact First: A sha256 of the full prompt is checked before anything else
+2. Paraphrase Tier: The user's own words are embedded as a normalized bag-of-words
+   vector and compared by cosine similarity against earlier answers
+3. Verified Hits: A similar answer is only reused when the two differ by filler words
+   alone - a negation, a different name or any other content word is a miss
+4. Context Chains: Paraphrase matches only count when everything else in the prompt
+   (stage, guidance, earlier responses) is identical, so contextual prompts never collide
+5. Opt-In and Bounded: Bots only create a cache when asked to. At most `max_entries`
+   responses are kept, oldest dropped first, and the JSONL file is compacted once it
+   holds twice that many lines
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from json_storage import ensure_directory
+
+DEFAULT_CACHE_FILE = "response_cache/response_cache.jsonl"
+DEFAULT_MAX_ENTRIES = 500
+
+# Below this many entries per context, scores accumulate in a dense list
+DENSE_SCORING_LIMIT = 256
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+# Words that may differ between two answers without changing what was said
+_FILLER_TOKENS = frozenset({
+    "a", "an", "the", "really", "very", "just", "so", "quite", "truly",
+    "actually", "well", "um", "uh", "oh"
+})
+
+
+class ResponseCache:
+    """
+    Prompt -> response cache with exact and paraphrase lookup
+
+    Architecture Concept: Embeddings are sparse {token: weight} dicts built from the
+    query text itself - no model download. Cosine similarity ranks the candidates;
+    the token check then rejects any that say something different.
+    """
+
+    def __init__(self, cache_file: Optional[str] = DEFAULT_CACHE_FILE,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, threshold: float = 0.92):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.threshold = threshold
+
+        # Insertion order doubles as the eviction queue - the first key is the oldest
+        self._exact: Dict[str, Dict] = {}
+        self._file_lines = 0
+
+        # Per context: (entry key, embedding) for each cached answer plus an inverted
+        # index token -> [(entry, weight)]. Scoring walks only the postings of the
+        # query's tokens - a sparse matrix-vector product over all cached embeddings at
+        # once instead of one dot product per entry. Evicted keys are skipped on lookup
+        # and dropped when the index is rebuilt.
+        self._by_context: Dict[str, Tuple[List[Tuple[str, Dict[str, float]]],
+                                          Dict[str, List[Tuple[int, float]]]]] = {}
+        self._indexed = 0
+
+        if cache_file and os.path.exists(cache_file):
+            self._load()
+
+    @staticmethod
+    def embed(text: str) -> Dict[str, float]:
+        """Embed text as an L2-normalized term-frequency vector"""
+        counts = Counter(_TOKEN_RE.findall(text.lower()))
+        norm = math.sqrt(sum(count * count for count in counts.values()))
+        if not norm:
+            return {}
+        return {token: count / norm for token, count in counts.items()}
+
+    @staticmethod
+    def similarity(a: Dict[str, float], b: Dict[str, float]) -> float:
+        """Cosine similarity of two normalized embeddings"""
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(weight * b.get(token, 0.0) for token, weight in a.items())
+
+    @staticmethod
+    def same_meaning(a: Dict[str, float], b: Dict[str, float]) -> bool:
+        """True when two embeddings differ only in filler words"""
+        return (a.keys() ^ b.keys()) <= _FILLER_TOKENS
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _context_key(self, prompt: str, query: str) -> str:
+        """Hash of the prompt with the user's query removed"""
+        return self._hash(prompt.replace(query, '\x00'))
+
+    def get(self, prompt: str, query: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            prompt: Full prompt that would be sent to the LLM
+            query: The user's words inside the prompt; enables paraphrase matching
+        """
+        entry = self._exact.get(self._hash(prompt))
+        if entry is not None:
+            return entry["response"]
+        if not query:
+            return None
+
+        context_index = self._by_context.get(self._context_key(prompt, query))
+        if not context_index:
+            return None
+        candidates, postings = context_index
+
+        # Small caches accumulate into a preallocated list (plain index arithmetic, no
+        # hashing); large ones into a dict so only entries sharing a token are touched
+        if len(candidates) < DENSE_SCORING_LIMIT:
+            scores = [0.0] * len(candidates)
+        else:
+            scores = defaultdict(float)
+
+        query_embedding = self.embed(query)
+        for token, weight in query_embedding.items():
+            for index, entry_weight in postings.get(token, ()):
+                scores[index] += weight * entry_weight
+
+        # Best score first; ties go to the earliest cached entry either way
+        indexes = range(len(scores)) if isinstance(scores, list) else scores
+        for index in sorted(indexes, key=lambda index: (-scores[index], index)):
+            if scores[index] < self.threshold:
+                break
+            key, embedding = candidates[index]
+            entry = self._exact.get(key)
+            if entry is not None and self.same_meaning(query_embedding, embedding):
+                return entry["response"]
+        return None
+
+    def put(self, prompt: str, response: str, query: Optional[str] = None,
+            embedding: Optional[Dict[str, float]] = None):
+        """
+        Store a response and append it to the cache file
+
+        Args:
+            embedding: Precomputed embed(query), e.g. from a background thread
+        """
+        entry = {
+            "key": self._hash(prompt),
+            "context": self._context_key(prompt, query) if query else None,
+            "query": query,
+            "response": response
+        }
+        self._add(entry, embedding)
+
+        if self.cache_file:
+            if self._file_lines >= 2 * self.max_entries:
+                self._compact()
+            else:
+                ensure_directory(os.path.dirname(self.cache_file))
+                with open(self.cache_file, 'a', encoding='utf-8') as f:
+                    f.write(self._line(entry))
+                self._file_lines += 1
+
+    @staticmethod
+    def _line(entry: Dict) -> str:
+        return json.dumps(entry, ensure_ascii=False) + "\n"
+
+    def _add(self, entry: Dict, embedding: Optional[Dict[str, float]] = None):
+        key = entry["key"]
+        self._exact.pop(key, None)
+        self._exact[key] = entry
+        while len(self._exact) > self.max_entries:
+            del self._exact[next(iter(self._exact))]
+
+        self._index(entry, embedding)
+        if self._indexed > 2 * self.max_entries:
+            self._rebuild_index()
+
+    def _index(self, entry: Dict, embedding: Optional[Dict[str, float]] = None):
+        """Make an entry findable by paraphrase within its context"""
+        if entry.get("context") and entry.get("query"):
+            if embedding is None:
+                embedding = self.embed(entry["query"])
+            candidates, postings = self._by_context.setdefault(entry["context"], ([], {}))
+            for token, weight in embedding.items():
+                postings.setdefault(token, []).append((len(candidates), weight))
+            candidates.append((entry["key"], embedding))
+            self._indexed += 1
+
+    def _rebuild_index(self):
+        """Drop evicted entries from the paraphrase index"""
+        self._by_context = {}
+        self._indexed = 0
+        for entry in self._exact.values():
+            self._index(entry)
+
+    def _compact(self):
+        """Rewrite the cache file with only the entries still held in memory"""
+        ensure_directory(os.path.dirname(self.cache_file))
+        temp_file = self.cache_file + ".tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.writelines(self._line(entry) for entry in self._exact.values())
+        os.replace(temp_file, self.cache_file)
+        self._file_lines = len(self._exact)
+
+    def _load(self):
+        """Rebuild the in-memory indexes from the cache file"""
+        with open(self.cache_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                self._file_lines += 1
+                try:
+                    entry = json.loads(line)
+                    self._add({
+                        "key": entry["key"],
+                        "context": entry.get("context"),
+                        "query": entry.get("query"),
+                        "response": entry["response"]
+                    })
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue  # Skip a partially written line
+
+    def __len__(self):
+        return len(self._exact)
@@ -10,10 +10,13 @@ Usage Examples:
   python run_demo.py --compare      # Compare Phase 3 vs Phase 4 systems
 """
 
+import io
 import os
 import sys
 import argparse
+import importlib
 import subprocess
+from contextlib import redirect_stderr, redirect_stdout
 from datetime import datetime
 
 def run_web_interface():
@@ -72,37 +75,50 @@ def run_cli_interface():
         print("\n\n👋 CLI session ended. Your discovery continues!")
 
 def run_all_tests():
-    """Run comprehensive test suite"""
+    """
+    Run comprehensive test suite
+
+    Architecture Concept: Each phase's test module is imported and its runner called
+    in this interpreter, so the suite pays for Python startup and the shared project
+    imports once instead of once per phase. Test output is captured as before and
+    only shown when a phase fails.
+    """
     print("🧪 Running Complete Test Suite...")
     print("=" * 60)
 
     test_phases = [
-        ("Phase 3: Self-Discovery Logic Engine", "test_phase3.py"),
-        ("Phase 4: Enhanced Intelligence", "test_phase4.py"),
-        ("Phase 5: User Interface & Visualization", "test_phase5.py")
+        ("Phase 3: Self-Discovery Logic Engine", "test_phase3", "run_all_tests"),
+        ("Phase 4: Enhanced Intelligence", "test_phase4", "run_all_phase4_tests"),
+        ("Phase 5: User Interface & Visualization", "test_phase5", "run_all_phase5_tests")
     ]
 
     results = []
 
-    for phase_name, test_file in test_phases:
-        print(f"\n🔍 Testing {phase_name}...")
-        try:
-            result = subprocess.run([
-                sys.executable, test_file
-            ], cwd=os.path.dirname(os.path.abspath(__file__)),
-               capture_output=True, text=True)
-
-            if result.returncode == 0:
-                print(f"✅ {phase_name}: PASSED")
-                results.append((phase_name, "PASSED"))
-            else:
-                print(f"❌ {phase_name}: FAILED")
-                print(f"Error: {result.stderr}")
-                results.append((phase_name, "FAILED"))
-
-        except Exception as e:
-            print(f"❌ {phase_name}: ERROR - {e}")
-            results.append((phase_name, "ERROR"))
+    # Tests read and write files relative to the project directory
+    previous_cwd = os.getcwd()
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    try:
+        for phase_name, test_module, runner_name in test_phases:
+            print(f"\n🔍 Testing {phase_name}...")
+            error_output = io.StringIO()
+            try:
+                with redirect_stdout(io.StringIO()), redirect_stderr(error_output):
+                    passed = getattr(importlib.import_module(test_module), runner_name)()
+
+                if passed:
+                    print(f"✅ {phase_name}: PASSED")
+                    results.append((phase_name, "PASSED"))
+                else:
+                    print(f"❌ {phase_name}: FAILED")
+                    print(f"Error: {error_output.getvalue()}")
+                    results.append((phase_name, "FAILED"))
+
+            except Exception as e:
+                print(f"❌ {phase_name}: ERROR - {e}")
+                results.append((phase_name, "ERROR"))
+    finally:
+        os.chdir(previous_cwd)
 
     # Summary
     print("\n" + "=" * 60)
@@ -231,7 +231,7 @@ class SpiritualGiftsAssessment:
 
         # Values alignment (25% of total score)
         values_responses = user_responses.get('values_clarification', [])
-        values_text = ' '.join([r.get('response', '').lower() for r in values_responses])
+        values_text = ' '.join(r.get('response', '').lower() for r in values_responses)
         required_values = gift_info['key_indicators']['values']
 
         values_matches = sum(1 for value in required_values if value in values_text)
@@ -240,11 +240,11 @@ class SpiritualGiftsAssessment:
             score_components['values_alignment'] = values_score
 
         # Response content analysis (25% of total score)
-        all_responses_text = ' '.join([
+        all_responses_text = ' '.join(
             r.get('response', '').lower()
             for stage_responses in user_responses.values()
             for r in stage_responses
-        ])
+        )
 
         behavioral_matches = sum(
             1 for marker in gift_info['behavioral_markers']
@@ -5,14 +5,23 @@ Maintains long-term context through intelligent summarization
 """
 
 import os
-import json
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from dotenv import load_dotenv
 
+from json_storage import dumps, loads, save_json, ensure_directory, timestamp_to_iso
+
 # Load environment variables
 load_dotenv()
 
+# Seconds to wait for a connection to Gemini, then for each read of its response
+_REQUEST_TIMEOUT = (5, 30)
+
+# Inputs that end the conversation
+_EXIT_COMMANDS = frozenset({'quit', 'exit', 'bye'})
+
 class SmartConversationMemory:
     """Enhanced memory with conversation summarization"""
     
@@ -28,7 +37,7 @@ class SmartConversationMemory:
         self.messages.append({
             "role": role,
             "content": content,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": time.time_ns()  # Epoch nanoseconds - converted to ISO when saved
         })
         
         # Check if we need to summarize old messages
@@ -152,19 +161,18 @@ Summary (2-3 sentences max):"""
         if not filename:
             filename = f"sessions/session_{self.session_id}.json"
         
-        os.makedirs("sessions", exist_ok=True)
+        ensure_directory("sessions")
         
         session_data = {
             "session_id": self.session_id,
-            "created": self.messages[0]["timestamp"] if self.messages else datetime.now().isoformat(),
+            "created": timestamp_to_iso(self.messages[0]["timestamp"]) if self.messages else datetime.now().isoformat(),
             "last_updated": datetime.now().isoformat(),
             "conversation_summary": self.conversation_summary,
             "recent_message_count": len(self.messages),
-            "messages": self.messages
+            "messages": [dict(msg, timestamp=timestamp_to_iso(msg["timestamp"])) for msg in self.messages]
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(session_data, f, indent=2, ensure_ascii=False)
+        save_json(filename, session_data)
         
         return filename
 
@@ -177,6 +185,12 @@ class SmartMemoryBot:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
         
         self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={self.api_key}"
+        
+        # One pooled HTTP session keeps the TLS connection to Gemini alive between turns
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        
         self.memory = SmartConversationMemory()
         
         self.system_prompt = """You are a wise and encouraging spiritual guide helping people discover their gifts and passions. 
@@ -184,27 +198,31 @@ class SmartMemoryBot:
         Reference previous insights naturally and build upon earlier discoveries.
         Ask thoughtful follow-up questions that help explore the connection between skills and passions.
         Keep responses warm, insightful, and concise."""
+        
+        # The persona never changes, so it is sent as a separate system instruction
+        # built once here - a stable prefix the API can reuse across turns
+        self._system_instruction = {"parts": [{"text": self.system_prompt}]}
     
     def call_gemini(self, user_input):
         """Make API call with smart context management"""
         context = self.memory.get_context()
-        full_prompt = f"{self.system_prompt}\n\n{context}\n\nUser: {user_input}\n\nBot:"
+        full_prompt = f"{context}\n\nUser: {user_input}\n\nBot:"
         
         payload = {
+            "systemInstruction": self._system_instruction,
             "contents": [{
+                "role": "user",
                 "parts": [{
                     "text": full_prompt
                 }]
             }]
         }
         
-        headers = {"Content-Type": "application/json"}
-        
         try:
-            response = requests.post(self.api_url, headers=headers, data=json.dumps(payload))
+            response = self.session.post(self.api_url, data=dumps(payload), timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            data = response.json()
+            data = loads(response.content)
             if 'candidates' in data and len(data['candidates']) > 0:
                 if 'content' in data['candidates'][0]:
                     parts = data['candidates'][0]['content']['parts']
@@ -215,7 +233,7 @@ class SmartMemoryBot:
             
         except requests.exceptions.RequestException as e:
             return f"Error calling API: {e}"
-        except KeyError as e:
+        except (KeyError, ValueError) as e:
             return f"Error parsing response: {e}"
     
     def _api_call_for_summary(self, prompt):
@@ -234,19 +252,20 @@ class SmartMemoryBot:
         
         while True:
             user_input = input("\nYou: ").strip()
+            command = user_input.lower()
             
-            if user_input.lower() in ['quit', 'exit', 'bye']:
+            if command in _EXIT_COMMANDS:
                 filename = self.memory.save_session()
                 print(f"\nBot: Our journey together has been meaningful! Session saved to {filename}")
                 print("May your path of discovery continue to unfold beautifully. 🙏")
                 break
             
-            if user_input.lower() == 'save':
+            if command == 'save':
                 filename = self.memory.save_session()
                 print(f"\nSession saved to {filename}")
                 continue
                 
-            if user_input.lower() == 'summary':
+            if command == 'summary':
                 if self.memory.conversation_summary:
                     print(f"\n--- Conversation Summary ---")
                     print(self.memory.conversation_summary)
@@ -255,7 +274,7 @@ class SmartMemoryBot:
                     print("\nNo conversation summary available yet.")
                 continue
                 
-            if user_input.lower() == 'history':
+            if command == 'history':
                 print(f"\n--- Recent Conversation ({len(self.memory.messages)} messages) ---")
                 for msg in self.memory.messages:
                     role_icon = "👤" if msg["role"] == "user" else "🤖"
@@ -5,18 +5,25 @@ Integrates all components: question progression, analysis, scoring, and spiritua
 """
 
 import os
-import json
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from dotenv import load_dotenv
 
 from discovery_engine import DiscoverySession
 from analysis_engine import SkillsPassionsAnalyzer
 from scoring_system import SpiritualGiftsAssessment
+from json_storage import dumps, loads
 
 # Load environment variables
 load_dotenv()
 
+# Seconds to wait for a connection to Gemini, then for each read of its response
+_REQUEST_TIMEOUT = (5, 30)
+
+# Inputs that end the conversation
+_EXIT_COMMANDS = frozenset({'quit', 'exit', 'bye'})
+
 class SpiritualGiftsDiscoveryBot:
     """Complete spiritual gifts discovery system with all Phase 3 functionality"""
 
@@ -27,6 +34,11 @@ class SpiritualGiftsDiscoveryBot:
 
         self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash-latest:generateContent?key={self.api_key}"
 
+        # One pooled HTTP session keeps the TLS connection to Gemini alive between turns
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
         # Initialize all components
         self.discovery_session = DiscoverySession()
         self.analyzer = SkillsPassionsAnalyzer()
@@ -44,6 +56,15 @@ You have access to structured conversation stages and can provide contextually a
 
 When responding, reference insights from earlier in the conversation and ask follow-up questions that go deeper into their gifts and calling."""
 
+        # Interactive commands besides the exit words, keyed by their lowercase form
+        self._commands = {
+            'save': self._save_session,
+            'progress': self._show_progress,
+            'skip': self._skip_stage,
+            'analyze': self._generate_analysis,
+            'help': self._show_help
+        }
+
     def call_gemini(self, prompt):
         """Make API call to Gemini with enhanced error handling"""
         payload = {
@@ -54,13 +75,11 @@ When responding, reference insights from earlier in the conversation and ask fol
             }]
         }
 
-        headers = {"Content-Type": "application/json"}
-
         try:
-            response = requests.post(self.api_url, headers=headers, data=json.dumps(payload))
+            response = self.session.post(self.api_url, data=dumps(payload), timeout=_REQUEST_TIMEOUT)
             response.raise_for_status()
 
-            data = response.json()
+            data = loads(response.content)
             if 'candidates' in data and len(data['candidates']) > 0:
                 if 'content' in data['candidates'][0]:
                     parts = data['candidates'][0]['content']['parts']
@@ -71,7 +90,7 @@ When responding, reference insights from earlier in the conversation and ask fol
 
         except requests.exceptions.RequestException as e:
             return f"I'm experiencing a connection issue: {str(e)[:100]}..."
-        except KeyError as e:
+        except (KeyError, ValueError) as e:
             return f"I'm having trouble processing that. Could you rephrase your response?"
 
     def start_discovery_journey(self):
@@ -99,29 +118,15 @@ When responding, reference insights from earlier in the conversation and ask fol
         while True:
             user_input = input("\nYou: ").strip()
 
-            # Handle special commands
-            if user_input.lower() in ['quit', 'exit', 'bye']:
+            # Handle special commands - lowercased once, then a table lookup
+            command = user_input.lower()
+            if command in _EXIT_COMMANDS:
                 self._handle_session_end()
                 break
 
-            elif user_input.lower() == 'save':
-                self._save_session()
-                continue
-
-            elif user_input.lower() == 'progress':
-                self._show_progress()
-                continue
-
-            elif user_input.lower() == 'skip':
-                self._skip_stage()
-                continue
-
-            elif user_input.lower() == 'analyze':
-                self._generate_analysis()
-                continue
-
-            elif user_input.lower() == 'help':
-                self._show_help()
+            handler = self._commands.get(command)
+            if handler:
+                handler()
                 continue
 
             if not user_input:
@@ -185,7 +190,7 @@ When responding, reference insights from earlier in the conversation and ask fol
         completion = summary["completion_percentage"]
 
         print(f"\n--- DISCOVERY PROGRESS ---")
-        print(f"Current Stage: {current_stage.replace('_', ' ').title()}")
+        print(f"Current Stage: {self.discovery_session.stage_title(current_stage)}")
         print(f"Overall Progress: {completion:.1f}%")
         print(f"Total Responses: {summary['total_responses']}")
 
@@ -193,7 +198,7 @@ When responding, reference insights from earlier in the conversation and ask fol
         for stage in self.discovery_session.stages:
             status = "✓" if self.discovery_session.stage_progress[stage]['completed'] else "○"
             count = self.discovery_session.stage_progress[stage]['question_count']
-            print(f"  {status} {stage.replace('_', ' ').title()} ({count} responses)")
+            print(f"  {status} {self.discovery_session.stage_title(stage)} ({count} responses)")
 
         print("--- END PROGRESS ---")
 
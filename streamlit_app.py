@@ -88,16 +88,12 @@ def create_sidebar():
             st.metric("Themes Identified", themes_count)
 
             # Show top themes
-            if st.session_state.context_manager.themes:
+            top_themes = st.session_state.context_manager.top_themes(3)
+            if top_themes:
                 st.subheader("🎯 Emerging Themes")
-                sorted_themes = sorted(
-                    st.session_state.context_manager.themes.items(),
-                    key=lambda x: x[1].strength,
-                    reverse=True
-                )[:3]
 
-                for theme_name, theme in sorted_themes:
-                    st.write(f"**{theme_name.title()}**: {theme.strength:.1f} strength")
+                for theme in top_themes:
+                    st.write(f"**{theme.theme_name.title()}**: {theme.strength:.1f} strength")
 
         # Personality profile
         if hasattr(st.session_state, 'personality_profiler'):
@@ -461,7 +457,7 @@ def export_session():
             for insight in st.session_state.context_manager.insights
         ] if hasattr(st.session_state, 'context_manager') else [],
         'themes': {
-            name: {'strength': theme.strength, 'evidence_count': len(theme.evidence)}
+            name: {'strength': theme.strength, 'evidence_count': theme.mention_count}
             for name, theme in st.session_state.context_manager.themes.items()
         } if hasattr(st.session_state, 'context_manager') else {},
         'personality_profile': {
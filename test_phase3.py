@@ -13,6 +13,8 @@ from datetime import datetime
 from discovery_engine import DiscoverySession
 from analysis_engine import SkillsPassionsAnalyzer
 from scoring_system import SpiritualGiftsAssessment
+from keyword_automaton import KeywordAutomaton
+from response_cache import ResponseCache
 
 def test_discovery_session():
     """Test the discovery session progression system"""
@@ -103,11 +105,79 @@ def test_skills_passions_analyzer():
     assert 'passions_analysis' in full_analysis
     assert 'alignment_score' in full_analysis
 
+    # Repeat analysis of the same responses is served from the cache as an equal copy,
+    # so changing one result doesn't leak into the next
+    full_analysis['skills_analysis']['top_skills'].append('changed')
+    repeat_analysis = analyzer.generate_analysis_summary(sample_responses)
+    assert repeat_analysis['skills_analysis']['top_skills'] == skills_analysis['top_skills']
+    assert repeat_analysis['passions_analysis'] == full_analysis['passions_analysis']
+    assert repeat_analysis['summary'] == full_analysis['summary']
+
     print(f"   Skills identified: {skills_analysis['top_skills']}")
     print(f"   Passions identified: {passions_analysis['top_passions']}")
     print(f"   Alignment score: {alignment_score}")
     print(f"   Overlaps found: {len(overlaps)}")
 
+def test_keyword_automaton():
+    """Test that the automaton matches the same keywords as substring checks"""
+    print("\nTesting Keyword Automaton...")
+
+    keywords = ['art', 'artistic', 'heart', 'teach', 'each', 'lead']
+    automaton = KeywordAutomaton()
+    for keyword in keywords:
+        automaton.add_keyword(keyword, keyword.upper())
+    automaton.build()
+
+    text = "my heart is artistic and i teach and lead"
+    matches = {(keyword, payload) for _, keyword, payload in automaton.iter_matches(text)}
+
+    assert matches == {(keyword, keyword.upper()) for keyword in keywords if keyword in text}
+    assert automaton.distinct_matches(text) == matches
+
+    # Scanning in pieces finds the same matches, including ones split across pieces
+    first_half, state = automaton.resume_matches(text[:5])
+    second_half, _ = automaton.resume_matches(text[5:], state)
+    assert first_half | second_half == matches
+
+    # Reached states map back to the same matches
+    states, _ = automaton.resume_states(text)
+    outputs = dict(automaton.match_states())
+    assert {hit for state in states for hit in outputs[state]} == matches
+
+    print(f"   Automaton found {len(matches)} keywords in a single pass")
+
+def test_response_cache():
+    """Test exact and paraphrase lookups and the size cap in the response cache"""
+    print("\nTesting Response Cache...")
+
+    cache = ResponseCache(cache_file=None, max_entries=3)
+    query = "I really love teaching kids how to read"
+    prompt = f"STAGE: Skills\nCONTEXT: none\nUSER'S LATEST RESPONSE: {query}"
+    cache.put(prompt, "What a gift!", query)
+
+    # Exact prompt is a direct hit
+    assert cache.get(prompt) == "What a gift!"
+
+    # Same words reordered, or differing only by filler, in the same context is a hit
+    for paraphrase in ("I love teaching kids how to read really", "I love teaching kids how to read"):
+        assert cache.get(prompt.replace(query, paraphrase), paraphrase) == "What a gift!"
+
+    # A negation, a changed word, another context or another answer misses
+    for other in ("I really don't love teaching kids how to read",
+                  "I really love teaching adults how to read",
+                  "I enjoy fixing old cars on weekends"):
+        assert cache.get(prompt.replace(query, other), other) is None
+    paraphrase = "I love teaching kids how to read really"
+    assert cache.get(prompt.replace("Skills", "Passions").replace(query, paraphrase), paraphrase) is None
+
+    # Oldest entries are dropped once the cap is reached, paraphrases included
+    for i in range(3):
+        cache.put(f"{prompt} {i}", f"Response {i}")
+    assert len(cache) == 3 and cache.get(prompt) is None
+    assert cache.get(prompt.replace(query, paraphrase), paraphrase) is None
+
+    print(f"   Cache holding {len(cache)} response(s)")
+
 def test_scoring_system():
     """Test the spiritual gifts assessment system"""
     print("\nTesting Scoring System...")
@@ -237,6 +307,8 @@ def run_all_tests():
     try:
         test_discovery_session()
         test_skills_passions_analyzer()
+        test_keyword_automaton()
+        test_response_cache()
         test_scoring_system()
         test_integration()
 
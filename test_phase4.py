@@ -13,6 +13,7 @@ from datetime import datetime
 from context_manager import EnhancedContextManager
 from dynamic_questioning import DynamicQuestioningEngine
 from personality_profiler import PersonalityProfiler
+from json_storage import dumps, loads
 
 def test_context_manager():
     """Test the enhanced context management system"""
@@ -41,10 +42,46 @@ def test_context_manager():
     # Test theme tracking
     assert "teaching" in manager.themes
     assert manager.themes["teaching"].strength >= 1.0
+    strongest = max(theme.strength for theme in manager.themes.values())
+    assert manager.has_theme_with_strength(strongest)
+    assert not manager.has_theme_with_strength(strongest + 0.1)
+    top = manager.top_themes(2)
+    assert top[0].strength == strongest and len(top) == min(2, len(manager.themes))
+    assert manager.top_themes(3, min_strength=strongest + 0.1) == []
 
     # Test insight extraction
     high_confidence_insights = [i for i in manager.insights if i.confidence >= 0.8]
     assert len(high_confidence_insights) > 0
+    assert manager.high_confidence_insight_count() == len(high_confidence_insights)
+
+    # Evidence stays bounded and skips immediate repeats
+    for i in range(20):
+        manager.add_exchange(f"I teach a new class every week ({i})", "Great!", "skills_assessment")
+        manager.add_exchange(f"I teach a new class every week ({i})", "Great!", "skills_assessment")
+    evidence = list(manager.themes["teaching"].evidence)
+    assert len(evidence) == 8
+    assert len(set(evidence)) == len(evidence)
+
+    # Mentions keep counting after the evidence is full, repeats included
+    teaching = manager.themes["teaching"]
+    mentions = teaching.mention_count
+    assert mentions > 40
+    assert manager.get_conversation_summary()["themes"]["teaching"]["evidence_count"] == mentions
+
+    # Saved context round-trips through JSON
+    context_file = "test_context.json"
+    manager.save_context(context_file)
+    with open(context_file, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    os.remove(context_file)
+    assert saved["themes"]["teaching"]["evidence"] == evidence
+    assert saved["insights"][0]["insight_type"] == manager.insights[0].insight_type
+
+    # A snapshot saves the same data, and stays put as the conversation continues
+    snapshot = manager.snapshot()
+    manager.add_exchange("I teach on weekends too", "Great!", "skills_assessment")
+    assert loads(dumps(snapshot)) == saved
+    assert loads(dumps({1: "int keys are written as strings"})) == {"1": "int keys are written as strings"}
 
     print(f"   Context manager working: {len(manager.insights)} insights, {len(manager.themes)} themes")
 
@@ -82,9 +119,27 @@ def test_dynamic_questioning():
     assert next_question.question_type.value in ['deep_dive', 'follow_up']
     assert 'teaching' in next_question.question_text.lower() or 'explain' in next_question.question_text.lower()
 
+    # Deep dives rotate through the templates, up to the per-theme limit
+    rotation_engine = DynamicQuestioningEngine()
+    teaching_pattern = teaching_patterns[0]
+    first = rotation_engine._generate_deep_dive_question(teaching_pattern, '')
+    second = rotation_engine._generate_deep_dive_question(teaching_pattern, '')
+    assert first.question_text != second.question_text
+    assert rotation_engine._generate_deep_dive_question(teaching_pattern, '') is None
+
+    # Punctuation and line breaks inside a phrase don't hide it
+    punctuated_engine = DynamicQuestioningEngine()
+    punctuated_engine.analyze_response_patterns({'introduction': [
+        {'response': 'Honestly? People come to me,\n  and I love to teach; explain, mentor.'}
+    ]}, 'introduction')
+    assert any(p.pattern_name == 'strong_teaching_indicators' and 'Said: people come to me' in p.evidence
+               for p in punctuated_engine.response_patterns)
+
     # Test coverage tracking
     summary = engine.get_questioning_summary()
     assert summary['patterns_identified'] > 0
+    assert engine.high_confidence_pattern_count() == len(
+        [p for p in engine.response_patterns if p.confidence >= 0.8])
 
     print(f"   Dynamic questioning working: {len(patterns)} patterns identified, {next_question.question_type.value} question generated")
 
@@ -123,8 +178,25 @@ def test_personality_profiler():
         # Just verify style detection works - specific markers can vary
         assert profile.primary_style.value in ['analytical', 'expressive', 'practical', 'reflective']
 
+        # Updating one response at a time arrives at the same markers as a full build
+        incremental_profiler = PersonalityProfiler()
+        for response in responses:
+            incremental_profiler.update_profile(response)
+        assert incremental_profiler.current_profile.markers == profile.markers
+
         print(f"   {style_name.title()} style detected as: {profile.primary_style.value} (confidence: {profile.confidence:.2f})")
 
+    # Vocabulary words match whole words only, and count every time they are used
+    profiler = PersonalityProfiler()
+    assert profiler.analyze_communication_patterns(["What a lovely day"]).emotional_language_frequency == 0
+    assert profiler.analyze_communication_patterns(["I love it, love!"]).emotional_language_frequency == 2 / 4
+
+    # Only a window of recent responses is kept, but every response still counts
+    for i in range(profiler.sample_window + 10):
+        profiler.update_profile(f"I love helping people ({i})")
+    assert len(profiler.communication_samples) == profiler.sample_window
+    assert profiler.get_profile_summary()["total_samples"] == profiler.sample_window + 10
+
 def test_integration():
     """Test that all Phase 4 components work together"""
     print("Testing Full Phase 4 Integration...")
@@ -154,7 +154,7 @@ class SpiritualGiftsVisualizer:
         # Prepare themes data
         theme_names = list(themes_data.keys())
         theme_strengths = [themes_data[name].strength for name in theme_names]
-        evidence_counts = [len(themes_data[name].evidence) for name in theme_names]
+        evidence_counts = [themes_data[name].mention_count for name in theme_names]
 
         # Create bubble chart
         fig = go.Figure(data=go.Scatter(